@@ -4,7 +4,7 @@ from typing import Any
 
 from fsspec.implementations.local import LocalFileSystem, stringify_path
 
-from contractor.tools.fs.globmatch import glob_to_regex
+from contractor.tools.fs.globmatch import glob_dir_matchers, glob_to_regex
 from contractor.utils.formatting import norm_unicode
 from contractor.utils.settings import get_settings
 
@@ -180,42 +180,60 @@ class RootedLocalFileSystem(LocalFileSystem):
             max_files = get_settings().fs_max_files_per_walk
 
         regex = glob_to_regex(pattern)
+        dir_matchers, recursive = glob_dir_matchers(pattern)
         matches: set[str] = set()
         scanned = 0
         truncated = False
 
-        # Always walk the full tree: a non-recursive pattern like ``sub/*.py``
-        # still needs to descend into ``sub``. The regex is path-aware, so a
-        # non-recursive pattern naturally won't match deeper paths.
-        for host_root, dirs, files in os.walk(self.root_path, followlinks=False):
-            # Prune symlinked directories.
-            dirs[:] = [d for d in dirs if self._is_safe_entry(host_root, d)]
+        # Depth-first over os.scandir: DirEntry carries the d_type, so symlink
+        # and directory checks need no extra stat. Directories whose name
+        # cannot satisfy the pattern's leading segments are never opened, a
+        # non-recursive pattern stops descending at its own depth, and only
+        # files at a depth the pattern can reach count toward *max_files*.
+        stack: list[tuple[str, str, int]] = [(self.root_path, "", 0)]
+        while stack and not truncated:
+            host_dir, rel_dir, depth = stack.pop()
+            # Files outside the depths the pattern spans can never match.
+            files_can_match = depth == len(dir_matchers) or (
+                recursive and depth > len(dir_matchers)
+            )
+            try:
+                with os.scandir(host_dir) as it:
+                    entries = list(it)
+            except OSError:
+                continue
 
-            rel_root = os.path.relpath(host_root, self.root_path)
-            if rel_root == ".":
-                rel_root = ""
+            for entry in entries:
+                if entry.is_symlink():
+                    continue
 
-            for name in files:
-                if scanned >= max_files:
-                    truncated = True
-                    break
-                scanned += 1
+                normalized_name = norm_unicode(entry.name) or entry.name
+                rel_path = (
+                    f"{rel_dir}/{normalized_name}" if rel_dir else normalized_name
+                )
+
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
 
-                normalized_name = norm_unicode(name) or name
-                host_path = os.path.join(host_root, normalized_name)
+                if is_dir:
+                    if depth < len(dir_matchers):
+                        if dir_matchers[depth].match(normalized_name):
+                            stack.append((entry.path, rel_path, depth + 1))
+                    elif recursive:
+                        stack.append((entry.path, rel_path, depth + 1))
+                    continue
 
-                if os.path.islink(host_path):
+                if not files_can_match:
                     continue
 
-                rel_path = (
-                    f"{rel_root}/{normalized_name}" if rel_root else normalized_name
-                )
-                rel_path = norm_unicode(rel_path.replace(os.sep, "/")) or rel_path
+                if scanned >= max_files:
+                    truncated = True
+                    break
+                scanned += 1
 
                 if regex.match(rel_path):
                     matches.add("/" + rel_path)
 
-            if truncated:
-                break
-
         return sorted(matches), truncated
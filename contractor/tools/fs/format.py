@@ -1,11 +1,90 @@
 import json
-from collections.abc import Sequence
-from dataclasses import asdict, dataclass
-from typing import Any, Literal
+import sys
+from bisect import bisect_right
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+from itertools import accumulate, chain, islice, takewhile
+from typing import Any, Literal, cast
 
 from contractor.tools.fs.models import FileLoc, FsEntry
 from contractor.utils.formatting import xml_escape
 
+# ``asdict`` deep-copies the content-type record on every call, yet a listing
+# repeats a handful of labels across thousands of entries. Materialise each
+# label's payload once and hand out shallow copies.
+_FILETYPE_PAYLOADS: dict[str, dict[str, Any]] = {}
+
+
+def _filetype_payload(filetype: Any) -> dict[str, Any]:
+    label = sys.intern(str(filetype.label))
+    payload = _FILETYPE_PAYLOADS.get(label)
+    if payload is None:
+        payload = _FILETYPE_PAYLOADS[label] = asdict(filetype)
+    return dict(payload)
+
+
+# ``json.dumps(..., ensure_ascii=False)`` builds a fresh encoder per call;
+# bind one up front for the per-entry "str" rendering.
+_JSON_ENCODE: Callable[[Any], str] = json.JSONEncoder(ensure_ascii=False).encode
+
+# Open/close tag pairs for the keys an entry or loc payload can carry.
+_XML_TAGS: dict[str, tuple[str, str]] = {
+    key: (f"<{key}>", f"</{key}>")
+    for key in (
+        "name",
+        "path",
+        "size",
+        "filetype",
+        "loc",
+        "line_start",
+        "line_end",
+        "byte_start",
+        "byte_end",
+        "content",
+    )
+}
+
+
+def _xml_fields(parts: list[str], payload: dict[str, Any]) -> None:
+    for key, value in payload.items():
+        open_tag, close_tag = _XML_TAGS.get(key) or (f"<{key}>", f"</{key}>")
+        parts.append(open_tag)
+        if isinstance(value, int):
+            # Sizes and line/byte offsets never need escaping.
+            parts.append(str(value))
+        else:
+            if isinstance(value, (dict, list)):
+                value = _JSON_ENCODE(value)
+            parts.append(xml_escape(str(value)))
+        parts.append(close_tag)
+
+
+def _loc_to_str(payload: dict[str, Any]) -> str:
+    return _JSON_ENCODE(payload)
+
+
+def _loc_to_xml(payload: dict[str, Any]) -> str:
+    parts = ["<loc>"]
+    _xml_fields(parts, payload)
+    parts.append("</loc>")
+    return "".join(parts)
+
+
+def _entry_to_str(payload: dict[str, Any], kind: str) -> str:
+    return _JSON_ENCODE(payload)
+
+
+def _entry_to_xml(payload: dict[str, Any], kind: str) -> str:
+    payload.pop("kind", None)
+    parts = [f"<{kind}>"]
+    _xml_fields(parts, payload)
+    parts.append(f"</{kind}>")
+    return "".join(parts)
+
+
+def _passthrough(payload: dict[str, Any], *_: Any) -> dict[str, Any]:
+    return payload
+
 
 @dataclass(slots=True)
 class FileFormat:
@@ -17,6 +96,23 @@ class FileFormat:
     _format: Literal["str", "json", "xml", "yaml", "markdown"] = "json"
     loc: Literal["lines", "bytes"] = "lines"
 
+    # Renderers bound once from ``_format`` so the per-entry path in
+    # ls/glob/grep listings is a single call rather than a string dispatch.
+    _render_entry: Callable[[dict[str, Any], str], str | dict[str, Any]] = field(
+        init=False, repr=False, compare=False
+    )
+    _render_loc: Callable[[dict[str, Any]], str | dict[str, Any]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._render_entry = {"str": _entry_to_str, "xml": _entry_to_xml}.get(
+            self._format, _passthrough
+        )
+        self._render_loc = {"str": _loc_to_str, "xml": _loc_to_xml}.get(
+            self._format, _passthrough
+        )
+
     def _format_loc(self, loc: FileLoc) -> str | dict[str, Any]:
         if self.loc == "bytes":
             payload: dict[str, Any] = {
@@ -32,75 +128,48 @@ class FileFormat:
         if loc.content is not None:
             payload["content"] = loc.content
 
-        if self._format == "str":
-            return json.dumps(payload, ensure_ascii=False)
-
-        if self._format == "xml":
-            parts = ["<loc>"]
-            for key, value in payload.items():
-                parts.append(f"<{key}>{xml_escape(str(value))}</{key}>")
-            parts.append("</loc>")
-            return "".join(parts)
-
-        return payload
+        return self._render_loc(payload)
 
     def format_fs_entry(self, entry: FsEntry) -> str | dict[str, Any]:
         kind = "dir" if entry.is_dir else "file"
         payload: dict[str, Any] = {}
 
         if self.with_file_info:
-            payload.update(
-                {
-                    "kind": kind,
-                    "name": entry.name,
-                    "path": entry.path,
-                    "size": entry.size,
-                }
-            )
+            payload["kind"] = kind
+            payload["name"] = entry.name
+            payload["path"] = entry.path
+            payload["size"] = entry.size
 
         if self.with_types and entry.filetype is not None:
             try:
-                payload["filetype"] = asdict(entry.filetype)
+                payload["filetype"] = _filetype_payload(entry.filetype)
             except Exception:
                 payload["filetype"] = str(entry.filetype)
 
         if entry.loc is not None:
             payload["loc"] = self._format_loc(entry.loc)
 
-        if self._format == "str":
-            return json.dumps(payload, ensure_ascii=False)
-
-        if self._format == "xml":
-            parts = [f"<{kind}>"]
-            xml_payload = dict(payload)
-            xml_payload.pop("kind", None)
-
-            for key, value in xml_payload.items():
-                if isinstance(value, (dict, list)):
-                    serialized = json.dumps(value, ensure_ascii=False)
-                    parts.append(f"<{key}>{xml_escape(serialized)}</{key}>")
-                else:
-                    parts.append(f"<{key}>{xml_escape(str(value))}</{key}>")
-
-            parts.append(f"</{kind}>")
-            return "".join(parts)
-
-        return payload
+        return self._render_entry(payload, kind)
 
     def format_file_list(
         self,
-        files: Sequence[FsEntry | None],
+        files: Iterable[FsEntry | None],
     ) -> str | list[dict[str, Any]]:
-        cleaned = [file for file in files if file is not None]
+        # Render straight off the input: no filtered copy of *files*, and the
+        # xml wrapper tags join in the same pass instead of a second concat.
+        rendered = map(
+            self.format_fs_entry, (file for file in files if file is not None)
+        )
 
         if self._format == "str":
-            return "\n".join(str(self.format_fs_entry(file)) for file in cleaned)
+            return "\n".join(map(str, rendered))
 
         if self._format == "xml":
-            inner = "".join(str(self.format_fs_entry(file)) for file in cleaned)
-            return f"<files>{inner}</files>"
+            return "".join(chain(("<files>",), map(str, rendered), ("</files>",)))
 
-        return [self.format_fs_entry(file) for file in cleaned]  # type: ignore[return-value]
+        # Every other format renders through ``_passthrough``: entries are the
+        # payload dicts themselves.
+        return cast(list[dict[str, Any]], list(rendered))
 
     @staticmethod
     def format_output(
@@ -109,6 +178,7 @@ class FileFormat:
         *,
         base_offset: int | None = None,
         max_lines: int | None = None,
+        total_lines: int | None = None,
     ) -> str:
         """Truncate *content* to ``max_output`` bytes on a line boundary.
 
@@ -124,33 +194,37 @@ class FileFormat:
         ready-to-use ``offset`` so the agent can resume with
         ``read_file(offset=<offset>)``. It is left ``None`` for non-paginated
         callers (e.g. diff output) so no misleading offset is emitted.
+
+        ``total_lines`` lets a caller hand in only a leading window of a longer
+        text (one that reaches past the cut point); the footer then counts the
+        remaining lines against it instead of against the window.
         """
         lines = content.splitlines(True)
-        out_parts: list[str] = []
-        out_bytes = 0
-        cut_at_line: int | None = None
-
-        for index, line in enumerate(lines):
-            if max_lines is not None and index >= max_lines:
-                cut_at_line = index
-                break
-            line_bytes = len(line.encode("utf-8", errors="ignore"))
-            if out_bytes + line_bytes > max_output:
-                cut_at_line = index
-                break
-
-            out_parts.append(line)
-            out_bytes += line_bytes
+        line_cap = len(lines) if max_lines is None else min(max_lines, len(lines))
+        sizes: Iterable[int] = (
+            map(len, lines)
+            if content.isascii()
+            else (len(line.encode("utf-8", errors="ignore")) for line in lines)
+        )
+        # Running byte totals of the lines that fit both caps. takewhile stops
+        # at the first line over budget, so lines past the cut are never encoded.
+        kept_bytes = list(
+            takewhile(
+                lambda total: total <= max_output,
+                accumulate(islice(sizes, line_cap)),
+            )
+        )
 
-        if cut_at_line is None:
-            return "".join(out_parts)
+        if len(kept_bytes) == len(lines):
+            return content
 
         def _footer(emitted: int) -> str:
             # All three fields derive from `emitted` (the lines actually kept
             # after any footer-fit trim), so they stay mutually consistent —
-            # `cut_at_line` is the pre-trim cut point and would over-state what
-            # was emitted / under-state what remains.
-            remaining = max(0, len(lines) - emitted)
+            # `len(kept_bytes)` is the pre-trim cut point and would over-state
+            # what was emitted / under-state what remains.
+            total = len(lines) if total_lines is None else total_lines
+            remaining = max(0, total - emitted)
             segments = [
                 f"### truncated at line: {emitted} ###",
                 f"lines left in the file: {remaining} ###",
@@ -162,17 +236,15 @@ class FileFormat:
                 segments.append(f"resume with read_file offset={base_offset + emitted} ###")
             return "\n\n" + " ".join(segments)
 
-        footer = _footer(len(out_parts))
+        footer = _footer(len(kept_bytes))
         footer_bytes = len(footer.encode("utf-8", errors="ignore"))
 
         if footer_bytes > max_output:
             return footer[:max_output]
 
-        while out_parts and (out_bytes + footer_bytes) > max_output:
-            removed = out_parts.pop()
-            out_bytes -= len(removed.encode("utf-8", errors="ignore"))
+        # Drop trailing lines until the footer fits alongside them.
+        emitted = bisect_right(kept_bytes, max_output - footer_bytes)
 
         # Recompute so the resume offset reflects the lines actually kept
         # after trimming for the footer (prevents skipping a popped line).
-        footer = _footer(len(out_parts))
-        return "".join(out_parts) + footer
+        return "".join(lines[:emitted]) + _footer(emitted)
@@ -188,6 +188,11 @@ def _normalize_path(path: str) -> str:
     return path.strip("/")
 
 
+def _glob_matcher(pattern: str) -> Callable[[str], Any]:
+    """Translate an fnmatch *pattern* once; the result is reused across a whole tree."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
 class TreeEntry:
     __slots__ = ("path", "name", "entry_type", "size", "data")
 
@@ -677,11 +682,11 @@ class _GitlabApiFallback:
         return self._match_tree(raw_tree, pattern)
 
     def _match_tree(self, raw_tree: list[dict[str, Any]], pattern: str) -> list[str]:
-        norm_pattern = _normalize_path(pattern)
+        match = _glob_matcher(_normalize_path(pattern))
         matches: list[str] = []
         for item in raw_tree:
             entry_path = item["path"]
-            if fnmatch.fnmatch(entry_path, norm_pattern):
+            if match(entry_path):
                 matches.append("/" + entry_path)
         return sorted(set(matches))
 
@@ -756,14 +761,16 @@ class _GitlabApiFallback:
                 def matcher(line):
                     return pattern in line
 
+        path_match = (
+            _glob_matcher(_normalize_path(path_pattern)) if path_pattern else None
+        )
+
         for item in raw_results:
             file_path = item.get("filename", item.get("path", ""))
 
             # Filter by path pattern
-            if path_pattern:
-                norm_path_pattern = _normalize_path(path_pattern)
-                if not fnmatch.fnmatch(file_path, norm_path_pattern):
-                    continue
+            if path_match is not None and not path_match(file_path):
+                continue
 
             # GitLab search returns 'data' with matched content
             data = item.get("data", "")
@@ -1288,11 +1295,12 @@ class GitlabFileSystem(fsspec.AbstractFileSystem):
         return self._fallback.glob_via_api(pattern)
 
     def _glob_in_memory(self, pattern: str) -> list[str]:
+        match = _glob_matcher(pattern)
         matches: list[str] = []
         for entry_path in self._entries:
             if not entry_path:
                 continue
-            if fnmatch.fnmatch(entry_path, pattern):
+            if match(entry_path):
                 matches.append("/" + entry_path)
         return sorted(set(matches))
 
@@ -1347,7 +1355,7 @@ class GitlabFileSystem(fsspec.AbstractFileSystem):
         max_count: int | None,
     ) -> list[dict[str, Any]]:
         """Search in-memory file contents."""
-        norm_glob = _normalize_path(path_glob)
+        glob_match = _glob_matcher(_normalize_path(path_glob))
         results: list[dict[str, Any]] = []
 
         if fixed_string:
@@ -1369,7 +1377,7 @@ class GitlabFileSystem(fsspec.AbstractFileSystem):
             if not entry_path or not entry.is_file or entry.data is None:
                 continue
 
-            if not fnmatch.fnmatch(entry_path, norm_glob):
+            if not glob_match(entry_path):
                 continue
 
             try:
@@ -65,3 +65,22 @@ def glob_to_regex(pattern: str) -> re.Pattern[str]:
         if idx != last:
             parts.append("/")
     return re.compile("(?s:" + "".join(parts) + r")\Z")
+
+
+def glob_dir_matchers(pattern: str) -> tuple[tuple[re.Pattern[str], ...], bool]:
+    """
+    Split *pattern* into per-depth directory matchers for walk pruning.
+
+    Returns ``(matchers, recursive)``. A directory at depth ``d`` (0-based,
+    relative to the glob root) can only contain matches if ``matchers[d]``
+    matches its name; once ``d >= len(matchers)`` it can only contain matches
+    when the pattern is *recursive* (contains a ``**`` segment).
+    """
+    segments = pattern.split("/")
+    recursive = "**" in segments
+    dir_segments = segments[: segments.index("**")] if recursive else segments[:-1]
+    matchers = tuple(
+        re.compile("(?s:" + _translate_glob_segment(seg) + r")\Z")
+        for seg in dir_segments
+    )
+    return matchers, recursive
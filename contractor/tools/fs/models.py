@@ -1,7 +1,10 @@
 import re
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import ClassVar, Optional
+from functools import lru_cache
+from typing import Any, ClassVar, Final, Optional
 from weakref import WeakKeyDictionary
 
 import fsspec
@@ -9,6 +12,25 @@ from magika import ContentTypeInfo, Magika
 
 from contractor.utils.formatting import norm_unicode
 
+# Magika's model only looks at the first and last ``block_size`` bytes, so
+# classifying ``head + tail`` gives the same answer as classifying the file.
+# The size comes from the loaded model's config; this is the fallback should
+# a Magika release stop exposing it.
+_MAGIKA_BLOCK_SIZE: Final[int] = 4096
+
+
+@lru_cache(maxsize=1)
+def _magika() -> Magika:
+    """Load the Magika model on first use rather than at import time."""
+    return Magika()
+
+
+@lru_cache(maxsize=1)
+def _magika_block_size() -> int:
+    """Bytes Magika reads from each end of a file, per its model config."""
+    config = getattr(_magika(), "_model_config", None)
+    return int(getattr(config, "block_size", _MAGIKA_BLOCK_SIZE))
+
 
 class InteractionKind(str, Enum):
     READ = "read"
@@ -87,17 +109,29 @@ class FsEntry:
     filetype: ContentTypeInfo | None = None
     loc: FileLoc | None = None
 
-    _magika: ClassVar[Magika] = Magika()
     # Per-fs path-keyed cache. Held weakly so fs instances can be GC'd.
     # Each entry is the dict[path, ContentTypeInfo|None] for that fs.
     _filetype_cache: ClassVar[
         "WeakKeyDictionary[fsspec.AbstractFileSystem, dict[str, ContentTypeInfo | None]]"
     ] = WeakKeyDictionary()
 
+    @staticmethod
+    def _read_magika_sample(fs: fsspec.AbstractFileSystem, file_path: str) -> bytes:
+        """Read the head and tail blocks Magika classifies, not the whole file."""
+        block_size = _magika_block_size()
+        with fs.open(file_path, mode="rb") as f:
+            head = f.read(2 * block_size + 1)
+            if len(head) <= 2 * block_size:
+                return head
+            f.seek(-block_size, 2)
+            return head[:block_size] + f.read(block_size)
+
     @staticmethod
     def identify_type(
         file_path: str,
         fs: fsspec.AbstractFileSystem,
+        *,
+        info: dict[str, Any] | None = None,
     ) -> ContentTypeInfo | None:
         try:
             cache = FsEntry._filetype_cache.setdefault(fs, {})
@@ -108,12 +142,22 @@ class FsEntry:
         if cache is not None and file_path in cache:
             return cache[file_path]
 
-        if not fs.exists(file_path) or not fs.isfile(file_path):
-            result: ContentTypeInfo | None = None
-        else:
+        result: ContentTypeInfo | None = None
+        if info is None:
+            try:
+                info = fs.info(file_path)
+            except Exception:
+                info = None
+
+        if info is not None and info.get("type") == "file":
             try:
-                with fs.open(file_path, mode="rb") as f:
-                    result = FsEntry._magika.identify_stream(f).output
+                if info.get("size") == 0:
+                    # Magika answers "empty" without looking at any bytes.
+                    result = _magika().identify_bytes(b"").output
+                else:
+                    result = _magika().identify_bytes(
+                        FsEntry._read_magika_sample(fs, file_path)
+                    ).output
             except Exception:
                 result = None
 
@@ -151,20 +195,48 @@ class FsEntry:
         with_types: bool = True,
     ) -> Optional["FsEntry"]:
         normalized_path = norm_unicode(path)
-        if normalized_path is None or not fs.exists(normalized_path):
+        if normalized_path is None:
+            return None
+
+        try:
+            info = fs.info(normalized_path)
+        except Exception:
+            return None
+
+        return cls.from_info(info, fs, path=normalized_path, with_types=with_types)
+
+    @classmethod
+    def from_info(
+        cls,
+        info: dict[str, Any],
+        fs: fsspec.AbstractFileSystem,
+        *,
+        path: str | None = None,
+        with_types: bool = True,
+    ) -> Optional["FsEntry"]:
+        """Build an entry from an fsspec ``info`` dict without touching *fs*
+        again (except to identify the file type). *path* overrides
+        ``info["name"]`` for backends whose info reports host paths."""
+        normalized_path = norm_unicode(str(info["name"]) if path is None else path)
+        if normalized_path is None:
             return None
 
         name = norm_unicode(normalized_path.rstrip("/").split("/")[-1]) or ""
+        kind = info.get("type")
 
-        if fs.isdir(normalized_path):
+        if kind == "directory":
             return cls(name=name, path=normalized_path, size=0, is_dir=True)
 
-        if fs.isfile(normalized_path):
-            filetype = cls.identify_type(normalized_path, fs) if with_types else None
+        if kind == "file":
+            filetype = (
+                cls.identify_type(normalized_path, fs, info=info)
+                if with_types
+                else None
+            )
             return cls(
                 name=name,
                 path=normalized_path,
-                size=int(fs.size(normalized_path)),
+                size=int(info.get("size") or 0),
                 is_dir=False,
                 filetype=filetype,
             )
@@ -174,25 +246,66 @@ class FsEntry:
     @staticmethod
     def _compute_line_starts(text: str) -> list[int]:
         starts = [0]
-        for match in re.finditer(r"\n", text):
-            starts.append(match.end())
+        pos = text.find("\n")
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find("\n", pos + 1)
         return starts
 
     @staticmethod
     def _char_to_line(line_starts: list[int], char_pos: int) -> int:
-        lo, hi = 0, len(line_starts) - 1
-        while lo <= hi:
-            mid = (lo + hi) // 2
-            if line_starts[mid] <= char_pos:
-                lo = mid + 1
-            else:
-                hi = mid - 1
-        return max(0, hi)
+        return max(0, bisect_right(line_starts, char_pos) - 1)
+
+    @classmethod
+    def _line_resolver(cls, line_starts: list[int]) -> Callable[[int], int]:
+        """Map character offsets to 0-based line indexes over *line_starts*.
+
+        Ascending positions (grep's match order) walk a cursor forward, so a
+        file's matches cost one pass over its line starts in total; a
+        backwards step falls back to ``_char_to_line``'s binary search.
+        """
+        last = len(line_starts) - 1
+        line_at = 0
+
+        def resolve(char_pos: int) -> int:
+            nonlocal line_at
+            if char_pos < line_starts[line_at]:
+                line_at = cls._char_to_line(line_starts, char_pos)
+                return line_at
+            while line_at < last and line_starts[line_at + 1] <= char_pos:
+                line_at += 1
+            return line_at
+
+        return resolve
+
+    @staticmethod
+    def _byte_offset_resolver(text: str) -> Callable[[int], int]:
+        """Map character offsets in *text* to UTF-8 byte offsets.
+
+        Pure-ASCII text maps one-to-one. Otherwise each lookup encodes only the
+        span since the previous one, so ascending positions (grep's match
+        order) encode every character once instead of re-encoding the whole
+        prefix per match; a backwards step restarts from the beginning.
+        """
+        if text.isascii():
+            return int
+
+        char_at = byte_at = 0
+
+        def resolve(char_pos: int) -> int:
+            nonlocal char_at, byte_at
+            if char_pos < char_at:
+                char_at = byte_at = 0
+            byte_at += len(text[char_at:char_pos].encode("utf-8", errors="ignore"))
+            char_at = char_pos
+            return byte_at
+
+        return resolve
 
     @classmethod
     def from_matches(
         cls,
-        matches: list[re.Match[str]],
+        matches: Sequence[re.Match[str] | tuple[int, int]],
         file_path: str,
         fs: fsspec.AbstractFileSystem,
         *,
@@ -200,8 +313,16 @@ class FsEntry:
         with_types: bool = True,
         excerpt_max_chars: int = 500,
         context_lines: int = 0,
+        info: dict[str, Any] | None = None,
     ) -> list["FsEntry"] | None:
-        if not fs.exists(file_path) or not fs.isfile(file_path):
+        # A caller that already holds the file's fsspec ``info`` passes it in
+        # so the path is not stat'ed a second time.
+        if info is None:
+            try:
+                info = fs.info(file_path)
+            except Exception:
+                return None
+        if info.get("type") != "file":
             return None
 
         if not matches:
@@ -213,24 +334,27 @@ class FsEntry:
             except Exception:
                 return []
 
-        proto = cls.from_path(file_path, fs, with_types=with_types)
+        proto = cls.from_info(info, fs, path=file_path, with_types=with_types)
         if proto is None:
             return None
 
-        line_starts = cls._compute_line_starts(content)
+        to_line = cls._line_resolver(cls._compute_line_starts(content))
         lines = content.splitlines()
+        to_byte = cls._byte_offset_resolver(content)
 
         entries: list[FsEntry] = []
         for match in matches:
-            begin_char, end_char = match.span()
-            line_idx = cls._char_to_line(line_starts, begin_char)
+            begin_char, end_char = (
+                match if isinstance(match, tuple) else match.span()
+            )
+            line_idx = to_line(begin_char)
 
             line_start = max(0, line_idx - context_lines)
             line_end = min(len(lines) - 1, line_idx + context_lines)
 
             try:
-                byte_start = len(content[:begin_char].encode("utf-8", errors="ignore"))
-                byte_end = len(content[:end_char].encode("utf-8", errors="ignore"))
+                byte_start = to_byte(begin_char)
+                byte_end = to_byte(end_char)
             except Exception:
                 byte_start, byte_end = None, None
 
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import codecs
 import contextlib
-import fnmatch
 import re
-from collections.abc import Callable, Iterable, Iterator
+import string
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import chain
 from typing import Any, Final, TypeAlias
 
 import fsspec
+from fsspec.implementations.local import LocalFileSystem
 from google.adk.tools.tool_context import ToolContext
 
 from contractor.tools.fs.const import (
@@ -22,7 +27,12 @@ from contractor.tools.fs.models import (
     InteractionFilter,
     InteractionKind,
 )
-from contractor.tools.fs.utils import _ensure_int_or_none, _is_ignored
+from contractor.tools.fs.utils import (
+    _compile_glob,
+    _compile_ignore_patterns,
+    _ensure_int_or_none,
+    _is_ignored_re,
+)
 from contractor.tools.fs.validation import PathValidationMixin
 from contractor.tools.observations import FILE_PATHS_STATE_KEY
 from contractor.tools.result import guard, ok_page
@@ -47,6 +57,245 @@ _WALK_TRUNCATION_NOTICE: Final[str] = (
 )
 
 
+# Line boundaries ``str.splitlines`` honours besides "\n", as raw UTF-8: the
+# ASCII controls plus the encodings of U+0085, U+2028 and U+2029. Text free of
+# them can be sliced on b"\n" alone without changing read_file's numbering.
+_EXTRA_LINE_BREAKS_RE: Final[re.Pattern[bytes]] = re.compile(
+    rb"[\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]"
+)
+
+
+def _skip_lines(content: bytes, count: int) -> int:
+    """Return the index just past the first *count* "\\n"-terminated lines."""
+    start = 0
+    for _ in range(count):
+        nxt = content.find(b"\n", start)
+        if nxt == -1:
+            return len(content)
+        start = nxt + 1
+    return start
+
+
+def _remainder_end(content: bytes, start: int, *, drop_final_break: bool) -> int:
+    """Return where read_file's decoded view of ``content[start:]`` ends.
+
+    Plain output drops the text's final "\\n"; after decoding with
+    ``errors="ignore"`` that is the last "\\n" whenever only undecodable bytes
+    follow it.
+    """
+    if drop_final_break:
+        final = content.rfind(b"\n", start) + 1
+        if final and not content[final:].decode("utf-8", errors="ignore"):
+            return final - 1
+    return len(content)
+
+
+def _window_end(
+    content: bytes, start: int, stop: int, max_lines: int | None, max_output: int
+) -> int:
+    """Return where ``format_output`` can stop looking at ``content[start:stop]``.
+
+    The window runs through the first line past the ``max_lines`` cap or the
+    first line that pushes it over ``max_output`` bytes, whichever comes
+    first; every line ``format_output`` could emit, plus the one that makes it
+    cut, lies inside it. Returns *stop* when no cap binds.
+    """
+    pos = start
+    taken = 0
+    while (max_lines is None or taken <= max_lines) and pos - start <= max_output:
+        nxt = content.find(b"\n", pos, stop)
+        if nxt == -1:
+            return stop
+        pos = nxt + 1
+        taken += 1
+    return pos
+
+
+def _count_lines(content: bytes, start: int, stop: int) -> int:
+    """Return ``len(content[start:stop].splitlines())`` once decoded, for
+    "\\n"-only text."""
+    last = content.rfind(b"\n", start, stop) + 1 or start
+    tail = content[last:stop].decode("utf-8", errors="ignore")
+    return content.count(b"\n", start, stop) + bool(tail)
+
+
+# Characters with a regex meaning outside a character class. A grep pattern
+# free of them is a plain literal and can skip the regex engine entirely.
+_REGEX_METACHARS: Final[frozenset[str]] = frozenset(".^$*+?{}[]\\|()")
+
+
+def _compile_search(pattern: str) -> Callable[[str], list[tuple[int, int]]]:
+    """Specialise grep's scanner on the shape of *pattern*.
+
+    Literal patterns are located with a ``str.find`` loop (non-overlapping,
+    like ``re.finditer``); anything else goes through the compiled regex.
+    Raises ``re.error`` for an invalid pattern.
+    """
+    regex = re.compile(pattern)
+    if not pattern or not _REGEX_METACHARS.isdisjoint(pattern):
+        return lambda text: [match.span() for match in regex.finditer(text)]
+
+    width = len(pattern)
+
+    def scan(text: str) -> list[tuple[int, int]]:
+        spans: list[tuple[int, int]] = []
+        pos = text.find(pattern)
+        while pos != -1:
+            spans.append((pos, pos + width))
+            pos = text.find(pattern, pos + width)
+        return spans
+
+    return scan
+
+
+# Block size for grep's streamed literal prefilter: a file that never contains
+# the required literal is dropped without holding more than one block of it.
+_GREP_BLOCK_SIZE: Final[int] = 64 * 1024
+
+# A grep walk over a local tree reads files through a small thread pool: reads
+# release the GIL, so disk I/O for the next files overlaps the matching done
+# for the previous ones.
+_GREP_READ_WORKERS: Final[int] = 8
+
+# Inline flags that change what a literal run matches (case folding, verbose
+# whitespace) — a literal prefilter would be unsound under them.
+_UNSAFE_INLINE_FLAGS_RE: Final[re.Pattern[str]] = re.compile(r"\(\?[aiLmsux-]*[ix]")
+
+
+# Escapes followed by a fixed number of hex digits (``\\x41``, ``\\u0041``...).
+_HEX_ESCAPE_WIDTHS: Final[dict[str, int]] = {"x": 2, "u": 4, "U": 8}
+
+
+def _required_literal(pattern: str) -> str:
+    """Longest literal run every match of *pattern* must contain ("" if none).
+
+    A deliberately conservative scan: only characters outside groups count,
+    a top-level alternation or a case-insensitive/verbose flag disables the
+    prefilter, and a character followed by an optional quantifier is dropped
+    from its run.
+    """
+    if _UNSAFE_INLINE_FLAGS_RE.search(pattern):
+        return ""
+
+    best = ""
+    run: list[str] = []
+    depth = 0
+    i, n = 0, len(pattern)
+
+    def close_run() -> None:
+        nonlocal best
+        if len(run) > len(best):
+            best = "".join(run)
+        run.clear()
+
+    while i < n:
+        c = pattern[i]
+        if c == "\\" and i + 1 < n:
+            nxt = pattern[i + 1]
+            i += 2
+            if depth == 0 and not nxt.isalnum() and nxt not in "\r\n":
+                run.append(nxt)
+                continue
+            close_run()
+            # Skip the rest of a multi-character escape so its hex, octal or
+            # name characters are not read as literal text.
+            if nxt in _HEX_ESCAPE_WIDTHS:
+                end = i + _HEX_ESCAPE_WIDTHS[nxt]
+                while i < min(end, n) and pattern[i] in string.hexdigits:
+                    i += 1
+            elif nxt == "N" and i < n and pattern[i] == "{":
+                end = pattern.find("}", i)
+                i = n if end == -1 else end + 1
+            elif nxt.isdigit():
+                # Octal escape or group backreference.
+                while i < n and pattern[i].isdigit():
+                    i += 1
+            continue
+        if c == "[":
+            # Skip the character class; "]" first in the class is literal.
+            close_run()
+            i += 1
+            if i < n and pattern[i] == "^":
+                i += 1
+            if i < n and pattern[i] == "]":
+                i += 1
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+            continue
+        if c in "?*{":
+            # The preceding atom may repeat zero times: drop it from the run
+            # (and skip a "{m,n}" body so its digits are not read as text).
+            if run:
+                run.pop()
+            close_run()
+            if c == "{":
+                end = pattern.find("}", i)
+                i = n if end == -1 else end
+        elif c == "(":
+            depth += 1
+            close_run()
+        elif c == ")":
+            depth = max(0, depth - 1)
+            close_run()
+        elif c == "|" and depth == 0:
+            return ""
+        elif c in ".^$+\r\n" or depth:
+            close_run()
+        else:
+            run.append(c)
+        i += 1
+
+    close_run()
+    return best
+
+
+def _read_if_contains(
+    fs: fsspec.AbstractFileSystem,
+    file_path: str,
+    literal: str,
+    *,
+    block_size: int = _GREP_BLOCK_SIZE,
+) -> bytes | None:
+    """Return the bytes of *file_path*, or ``None`` if it lacks *literal*.
+
+    The file is scanned in ``block_size`` binary blocks, each decoded the way
+    grep decodes the whole file (lenient UTF-8), so a literal that only forms
+    once invalid bytes are dropped still counts. The last
+    ``len(literal) - 1`` characters carry across blocks so a split literal is
+    still seen. Only on a hit is the whole file read (rewinding once); files
+    that cannot match never materialise more than one block.
+    """
+    if not literal:
+        return fs.cat_file(file_path)
+
+    keep = len(literal) - 1
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+    with fs.open(file_path, mode="rb") as fh:
+        tail = ""
+        while True:
+            block = fh.read(block_size)
+            window = tail + decoder.decode(block, final=not block)
+            if literal in window:
+                fh.seek(0)
+                return fh.read()
+            if not block:
+                return None
+            tail = window[-keep:] if keep else ""
+
+
+def _decode_grep_text(raw: bytes) -> str:
+    """Decode *raw* as ``fs.read_text`` does: lenient UTF-8, universal newlines.
+
+    Without the newline translation a CRLF file keeps its "\\r", so ``foo$``
+    stops matching and reported byte offsets drift.
+    """
+    text = raw.decode("utf-8", errors="ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def _push_fs_coverage(
     tool_context: ToolContext | None, snapshot: dict[str, int]
 ) -> None:
@@ -88,13 +337,12 @@ def _push_fs_paths(
 
 
 def _build_ignore_patterns(ignored_patterns: list[str] | None = None) -> list[str]:
-    seen: set[str] = set()
-    result: list[str] = []
-    for pattern in _IGNORE_DEFAULTS + (ignored_patterns or []):
-        if pattern and pattern not in seen:
-            seen.add(pattern)
-            result.append(pattern)
-    return result
+    # Ordered dedup without concatenating the defaults and the user list first.
+    return [
+        pattern
+        for pattern in dict.fromkeys(chain(_IGNORE_DEFAULTS, ignored_patterns or ()))
+        if pattern
+    ]
 
 
 class FsspecInteractionFileTools(PathValidationMixin):
@@ -146,9 +394,10 @@ class FsspecInteractionFileTools(PathValidationMixin):
         # on a per-invocation reset so it can't go stale across worker runs.
         self._in_scope_cache: list[str] | None = None
         self.patterns = _build_ignore_patterns(ignored_patterns)
+        self._ignore_re = _compile_ignore_patterns(tuple(self.patterns))
 
     def _is_ignored(self, path: str) -> bool:
-        return _is_ignored(path, self.patterns)
+        return _is_ignored_re(path, self._ignore_re)
 
     def _paginate(
         self,
@@ -161,17 +410,56 @@ class FsspecInteractionFileTools(PathValidationMixin):
         resolved_limit = self.max_items if limit is None else max(1, limit)
         return items[offset : offset + resolved_limit], offset, resolved_limit
 
-    def _read_text(
+    def _read_bytes(
         self,
         file_path: str,
         *,
         operation: str,
         interaction: InteractionKind,
-    ) -> str:
-        content = self.fs.read_text(file_path, encoding="utf-8", errors="ignore")
+    ) -> bytes:
+        content = self.fs.cat_file(file_path)
         self.record_interaction(file_path, operation, interaction=interaction)
         return content
 
+    def _entry_resolver(self) -> Callable[[str], FsEntry | None]:
+        """Return a ``FsEntry.from_path`` memoised for one tool call.
+
+        Backend globs may repeat a path and several symlinks may resolve to
+        the same target; each distinct path is stat-ed and typed once. The
+        memo lives only as long as the returned callable.
+        """
+        resolved: dict[str, FsEntry | None] = {}
+
+        def resolve(path: str) -> FsEntry | None:
+            if path not in resolved:
+                resolved[path] = FsEntry.from_path(
+                    path, self.fs, with_types=self.with_types
+                )
+            return resolved[path]
+
+        return resolve
+
+    def _read_candidates(
+        self,
+        read: Callable[[str], bytes | None],
+        paths: Sequence[str],
+    ) -> Iterator[bytes | None]:
+        """Yield ``read(path)`` for *paths* in order, prefetching local reads."""
+        if len(paths) < 2 or not isinstance(self.fs, LocalFileSystem):
+            yield from map(read, paths)
+            return
+
+        # At most ``_GREP_READ_WORKERS`` reads are in flight (or done but not
+        # yet consumed), so prefetching never holds more than that many files.
+        with ThreadPoolExecutor(max_workers=_GREP_READ_WORKERS) as pool:
+            pending: deque[Future[bytes | None]] = deque()
+            for path in paths:
+                if len(pending) == _GREP_READ_WORKERS:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(read, path))
+            while pending:
+                yield pending.popleft().result()
+
     def _iter_all_files(self, root: str) -> Iterator[str]:
         if not self.fs.exists(root):
             return
@@ -189,13 +477,10 @@ class FsspecInteractionFileTools(PathValidationMixin):
                     seen.add(full_path)
                     yield full_path
 
-    def _match_glob(self, file_path: str, root: str, pattern: str) -> bool:
+    def _match_glob(
+        self, file_path: str, root: str, match: Callable[[str], Any]
+    ) -> bool:
         file_path = normalize_slashes(file_path)
-        root = normalize_slashes(root).rstrip("/") or "/"
-        pattern = normalize_slashes(pattern)
-
-        if pattern == "**/*":
-            return True
 
         if root == "/":
             relative = file_path.lstrip("/")
@@ -205,13 +490,20 @@ class FsspecInteractionFileTools(PathValidationMixin):
                 file_path[len(prefix) :] if file_path.startswith(prefix) else file_path
             )
 
-        return fnmatch.fnmatch(relative, pattern) or fnmatch.fnmatch(file_path, pattern)
+        return match(relative) is not None or match(file_path) is not None
 
     def _matched_files(self, path: str, pattern: str) -> list[str]:
+        pattern = normalize_slashes(pattern)
+        if pattern == "**/*":
+            return sorted(self._iter_all_files(path))
+
+        # Translate the glob once per call rather than per walked file.
+        root = normalize_slashes(path).rstrip("/") or "/"
+        match = _compile_glob(pattern).match
         return sorted(
             file_path
             for file_path in self._iter_all_files(path)
-            if self._match_glob(file_path, path, pattern)
+            if self._match_glob(file_path, root, match)
         )
 
     def _interaction_entry(self, path: str) -> FileInteractionEntry | None:
@@ -386,15 +678,24 @@ class FsspecInteractionFileTools(PathValidationMixin):
             return err
 
         try:
-            items = self.fs.ls(normalized_path, detail=False)
+            items = self.fs.ls(normalized_path, detail=True)
         except TypeError:
             items = self.fs.ls(normalized_path)
 
-        entries = [
-            FsEntry.from_path(str(item), self.fs, with_types=self.with_types)
-            for item in items
-            if not self._is_ignored(str(item))
-        ]
+        entries: list[FsEntry | None] = []
+        resolve = self._entry_resolver()
+        for item in items:
+            detailed = isinstance(item, dict)
+            item_path = str(item["name"] if detailed else item)
+            if self._is_ignored(item_path):
+                continue
+            # Detailed listings already carry type and size, so a child costs
+            # no further stat; symlinks still resolve through from_path.
+            if detailed and not item.get("islink"):
+                entry = FsEntry.from_info(item, self.fs, with_types=self.with_types)
+            else:
+                entry = resolve(item_path)
+            entries.append(entry)
         return {"result": self.fmt.format_file_list(entries)}
 
     def glob(
@@ -445,12 +746,14 @@ class FsspecInteractionFileTools(PathValidationMixin):
                 if match.replace("\\", "/").startswith(prefix)
             ]
 
+        resolve = self._entry_resolver()
         entries = [
-            FsEntry.from_path(match, self.fs, with_types=self.with_types)
-            for match in matches
-            if not self._is_ignored(match)
+            entry
+            for entry in (
+                resolve(match) for match in matches if not self._is_ignored(match)
+            )
+            if entry is not None
         ]
-        entries = [entry for entry in entries if entry is not None]
         entries.sort(key=lambda entry: entry.path)
 
         total = len(entries)
@@ -488,7 +791,7 @@ class FsspecInteractionFileTools(PathValidationMixin):
             return err
 
         try:
-            content = self._read_text(
+            raw = self._read_bytes(
                 normalized_file,
                 operation="read_file",
                 interaction=InteractionKind.READ,
@@ -496,8 +799,6 @@ class FsspecInteractionFileTools(PathValidationMixin):
         except Exception as exc:
             return {"error": f"failed to read '{normalized_file}': {exc}"}
 
-        lines = content.splitlines()
-
         # No explicit limit → apply the configured default line cap (if any).
         if limit is None:
             limit = self.max_lines
@@ -505,9 +806,6 @@ class FsspecInteractionFileTools(PathValidationMixin):
         start_line = 1
         if offset is not None:
             offset = max(0, offset)
-            if offset >= len(lines):
-                return {"result": ""}
-            lines = lines[offset:]
             start_line = offset + 1
 
         # Hand the full post-offset slice (not a pre-trimmed one) plus the line
@@ -516,11 +814,51 @@ class FsspecInteractionFileTools(PathValidationMixin):
         # the true remaining count rather than the capped slice length.
         effective_limit = max(1, limit) if limit is not None else None
 
+        lines: list[str] | None = None
+        tail = ""
+        total_lines: int | None = None
+        if _EXTRA_LINE_BREAKS_RE.search(raw) is None:
+            # "\n"-only text: find line boundaries on the raw bytes and decode
+            # only the window format_output can emit, with the true remaining
+            # line count passed alongside for the footer.
+            start = _skip_lines(raw, offset or 0)
+            if offset is not None and start >= len(raw):
+                return {"result": ""}
+            stop = _remainder_end(
+                raw, start, drop_final_break=not with_line_numbers
+            )
+            end = _window_end(raw, start, stop, effective_limit, self.max_output)
+            window: str | None = None
+            if end < stop:
+                # Byte budgets only line up when nothing is dropped on decode;
+                # otherwise fall back to decoding the whole remainder.
+                with contextlib.suppress(UnicodeDecodeError):
+                    window = raw[start:end].decode("utf-8")
+                    total_lines = _count_lines(raw, start, stop)
+            if window is None:
+                tail = raw[start:].decode("utf-8", errors="ignore")
+            else:
+                tail = window
+        else:
+            lines = raw.decode("utf-8", errors="ignore").splitlines()
+            if offset is not None:
+                if offset >= len(lines):
+                    return {"result": ""}
+                lines = lines[offset:]
+
+        # A window keeps its last line's "\n" so format_output measures that
+        # line exactly as it would inside the full remainder.
+        windowed = total_lines is not None
         if with_line_numbers:
             sliced = "\n".join(
                 f"{line_no} | {line}"
-                for line_no, line in enumerate(lines, start=start_line)
-            )
+                for line_no, line in enumerate(
+                    tail.splitlines() if lines is None else lines, start=start_line
+                )
+            ) + ("\n" if windowed else "")
+        elif lines is None:
+            # Equivalent to "\n".join(tail.splitlines()) for "\n"-only text.
+            sliced = tail if windowed else tail.removesuffix("\n")
         else:
             sliced = "\n".join(lines)
         return {
@@ -529,6 +867,7 @@ class FsspecInteractionFileTools(PathValidationMixin):
                 self.max_output,
                 base_offset=start_line - 1,
                 max_lines=effective_limit,
+                total_lines=total_lines,
             )
         }
 
@@ -542,7 +881,7 @@ class FsspecInteractionFileTools(PathValidationMixin):
         normalized_pattern = norm_unicode(pattern)
 
         try:
-            regex = re.compile(normalized_pattern or "")
+            search = _compile_search(normalized_pattern or "")
         except re.error as err:
             return {
                 "error": INCORRECT_REGEXP_ERROR.format(
@@ -551,25 +890,37 @@ class FsspecInteractionFileTools(PathValidationMixin):
                 )
             }
 
-        if not self.fs.exists(normalized_path):
+        try:
+            path_info = self.fs.info(normalized_path)
+        except Exception:
             return {"error": PATH_NOT_FOUND_ERROR.format(path=normalized_path)}
 
-        def build_entries_for_file(file_path: str) -> list[FsEntry]:
+        # Files whose decoded text lacks the pattern's mandatory literal cannot
+        # match, so they are skipped before the full read and regex pass.
+        literal = _required_literal(normalized_pattern or "")
+
+        def read_candidate(file_path: str) -> bytes | None:
             if self._is_ignored(file_path):
-                return []
+                return None
 
             try:
-                content = self.fs.read_text(
-                    file_path, encoding="utf-8", errors="ignore"
-                )
+                return _read_if_contains(self.fs, file_path, literal)
             except Exception:
+                return None
+
+        def build_entries_for_file(
+            file_path: str,
+            raw: bytes | None,
+            info: dict[str, Any] | None = None,
+        ) -> list[FsEntry]:
+            if raw is None:
                 return []
+            content = _decode_grep_text(raw)
 
-            matches = list(regex.finditer(content))
-            if matches:
-                self.record_interaction(
-                    file_path, "grep", interaction=InteractionKind.MATCH
-                )
+            matches = search(content)
+            if not matches:
+                return []
+            self.record_interaction(file_path, "grep", interaction=InteractionKind.MATCH)
 
             return (
                 FsEntry.from_matches(
@@ -578,12 +929,15 @@ class FsspecInteractionFileTools(PathValidationMixin):
                     fs=self.fs,
                     content=content,
                     with_types=self.with_types,
+                    info=info,
                 )
                 or []
             )
 
-        if self.fs.isfile(normalized_path):
-            entries = build_entries_for_file(normalized_path)
+        if path_info.get("type") == "file":
+            entries = build_entries_for_file(
+                normalized_path, read_candidate(normalized_path), path_info
+            )
             total = len(entries)
             paged = entries[offset : offset + self.max_items]
 
@@ -595,22 +949,27 @@ class FsspecInteractionFileTools(PathValidationMixin):
                 limit=self.max_items,
             )
 
-        results: list[FsEntry] = []
-        scanned = 0
+        candidates: list[str] = []
         walk_truncated = False
         # Bound the tree walk so grep over a huge repo cannot run away; when
         # the ceiling is hit the (partial) results carry a truncation notice.
         for current_path, _dirs, filenames in self.fs.walk(normalized_path):
             for filename in filenames:
-                if scanned >= self.max_files_per_walk:
+                if len(candidates) >= self.max_files_per_walk:
                     walk_truncated = True
                     break
-                scanned += 1
-                full_path = join_path(current_path, filename)
-                results.extend(build_entries_for_file(full_path))
+                candidates.append(join_path(current_path, filename))
             if walk_truncated:
                 break
 
+        results: list[FsEntry] = []
+        for file_path, raw in zip(
+            candidates,
+            self._read_candidates(read_candidate, candidates),
+            strict=True,
+        ):
+            results.extend(build_entries_for_file(file_path, raw))
+
         results.sort(key=lambda entry: (entry.path, entry.loc.line_start or 0))
         total = len(results)
         paged = results[offset : offset + self.max_items]
@@ -1,4 +1,7 @@
 import fnmatch
+import re
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any
 from urllib.parse import quote as url_quote
 
@@ -11,15 +14,40 @@ def _project_id_encoded(project_id: str) -> str:
     return url_quote(project_id, safe="")
 
 
-def _is_ignored(path: str, patterns: list[str]) -> bool:
-    normalized = normalize_slashes(path)
-    basename = normalized.split("/")[-1]
-    return any(
-        fnmatch.fnmatch(normalized, pattern) or fnmatch.fnmatch(basename, pattern)
-        for pattern in patterns
+@lru_cache(maxsize=32)
+def _compile_ignore_patterns(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Fold fnmatch-style *patterns* into one anchored regex (``None`` if empty).
+
+    Cached on the pattern tuple, so tool instances built with the same ignore
+    list share a single compiled union.
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns)
     )
 
 
+@lru_cache(maxsize=256)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile an fnmatch-style *pattern* once (``fnmatch.fnmatch`` on POSIX paths)."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+def _is_ignored_re(path: str, ignore_re: re.Pattern[str] | None) -> bool:
+    """``_is_ignored`` against a union compiled by ``_compile_ignore_patterns``."""
+    if ignore_re is None:
+        return False
+    normalized = normalize_slashes(path)
+    if ignore_re.match(normalized) is not None:
+        return True
+    return ignore_re.match(normalized.rpartition("/")[2]) is not None
+
+
+def _is_ignored(path: str, patterns: Sequence[str]) -> bool:
+    return _is_ignored_re(path, _compile_ignore_patterns(tuple(patterns)))
+
+
 def _ensure_int_or_none(value: Any) -> int | None:
     if value is None:
         return None
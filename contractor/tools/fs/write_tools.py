@@ -18,8 +18,9 @@ from contractor.tools.fs.read_tools import (
     _push_fs_paths,
 )
 from contractor.tools.fs.utils import (
+    _compile_ignore_patterns,
     _ensure_int_or_none,
-    _is_ignored,
+    _is_ignored_re,
     _line_ending_for_text,
     _parse_bool,
     _split_lines_keepends,
@@ -52,6 +53,7 @@ class FsspecWriteTools(PathValidationMixin):
         )
 
         self.patterns = _build_ignore_patterns(ignored_patterns)
+        self._ignore_re = _compile_ignore_patterns(tuple(self.patterns))
 
         self.fmt = fmt or FileFormat(
             with_types=with_types,
@@ -105,7 +107,7 @@ class FsspecWriteTools(PathValidationMixin):
         return adapt(old_string), adapt(new_string)
 
     def _is_ignored(self, path: str) -> bool:
-        return _is_ignored(path, self.patterns)
+        return _is_ignored_re(path, self._ignore_re)
 
     def _ensure_interactions_enabled(self) -> ToolResult | None:
         if not self.with_interaction_tools:
@@ -292,10 +292,37 @@ class MemoryTools:
     fmt: MemoryFormat = field(default_factory=MemoryFormat)
     notes: dict[str, MemoryNote] = field(default_factory=dict)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    # Artifact text ``notes`` was parsed from (or last saved as): every tool
+    # call reloads, and an unchanged store keeps its notes and tag index.
+    _loaded_text: str | None = field(default=None, init=False, repr=False)
+    # tag -> names of the notes carrying it; built lazily from ``notes``.
+    _tag_index: dict[str, set[str]] | None = field(default=None, init=False, repr=False)
 
     def memory_key(self) -> str:
         return f"user:memory/{self.name}"
 
+    def _names_by_tag(self) -> dict[str, set[str]]:
+        if self._tag_index is None:
+            index: dict[str, set[str]] = {}
+            for note in self.notes.values():
+                for tag in note.tags:
+                    index.setdefault(tag, set()).add(note.name)
+            self._tag_index = index
+        return self._tag_index
+
+    def _reindex(self, name: str, old_tags: list[str], new_tags: list[str]) -> None:
+        index = self._tag_index
+        if index is None:
+            return
+        for tag in set(old_tags).difference(new_tags):
+            names = index.get(tag)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del index[tag]
+        for tag in new_tags:
+            index.setdefault(tag, set()).add(name)
+
     def _normalize_note(
         self, name: str, item: dict[str, Any], fallback_ordinal: int
     ) -> MemoryNote:
@@ -377,11 +404,17 @@ class MemoryTools:
     async def load(self, ctx: ToolContext | CallbackContext):
         async with self._lock:
             artifact = await ctx.load_artifact(filename=self.memory_key())
-            if artifact is None:
+            text = None if artifact is None else artifact.text or ""
+            if text is not None and text == self._loaded_text:
+                return
+
+            self._loaded_text = text
+            self._tag_index = None
+            if text is None:
                 self.notes = {}
                 return
 
-            raw = yaml.safe_load(artifact.text or "") or {}
+            raw = yaml.safe_load(text) or {}
             notes: dict[str, MemoryNote] = {}
             for index, (name, item) in enumerate(raw.items(), start=1):
                 if not isinstance(item, dict):
@@ -409,8 +442,12 @@ class MemoryTools:
 
     async def save(self, ctx: ToolContext | CallbackContext):
         async with self._lock:
-            artifact = types.Part.from_text(text=self.dump())
+            text = self.dump()
+            # Force a reparse on the next load should the save not land.
+            self._loaded_text = None
+            artifact = types.Part.from_text(text=text)
             await ctx.save_artifact(filename=self.memory_key(), artifact=artifact)
+            self._loaded_text = text
 
     async def list_memories(
         self,
@@ -424,10 +461,7 @@ class MemoryTools:
 
     async def list_tags(self, ctx: ToolContext | CallbackContext) -> list[str]:
         await self.load(ctx)
-        tags = set()
-        for memory in self.notes.values():
-            tags.update(memory.tags)
-        return sorted(tags)
+        return sorted(self._names_by_tag())
 
     async def write_memory(
         self,
@@ -480,6 +514,7 @@ class MemoryTools:
             )
 
         self.notes[name] = note
+        self._reindex(name, existing.tags if existing is not None else [], note.tags)
         await self.save(ctx)
 
     async def append_memory(
@@ -526,13 +561,14 @@ class MemoryTools:
         normalized = set(tags) - _RESERVED_TAGS
         if not normalized:
             return []
+        index = self._names_by_tag()
+        names = set().union(*(index.get(tag, ()) for tag in normalized))
         return sorted(
-            [
+            (
                 memory
-                for memory in self.notes.values()
+                for memory in map(self.notes.__getitem__, names)
                 if not _is_reserved(memory)
-                and any(tag in memory.tags for tag in normalized)
-            ],
+            ),
             key=lambda m: (m.ordinal, m.name),
         )
 
@@ -543,7 +579,7 @@ class MemoryTools:
     ) -> list[MemoryNote]:
         await self.load(ctx)
         return sorted(
-            [memory for memory in self.notes.values() if tag in memory.tags],
+            map(self.notes.__getitem__, self._names_by_tag().get(tag, ())),
             key=lambda m: (m.ordinal, m.name),
         )
 
@@ -1,5 +1,11 @@
 from .models import PathItem, RequestBody, Response, SecurityScheme
-from .openapi import OpenApiArtifact, openapi_tools, validate_files, validate_model
+from .openapi import (
+    OpenApiArtifact,
+    openapi_tools,
+    parse_openapi_text,
+    validate_files,
+    validate_model,
+)
 from .ref_resolver import resolve_local_refs, resolve_refs
 from .vacuum import openapi_linter_tools
 
@@ -7,6 +13,7 @@ __all__ = [
     "OpenApiArtifact",
     "openapi_tools",
     "openapi_linter_tools",
+    "parse_openapi_text",
     "validate_model",
     "validate_files",
     "PathItem",
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 import json
-from collections.abc import Callable
+import re
+from collections.abc import Callable, Sequence
 from dataclasses import asdict, dataclass, field
 from typing import Any, Final, Literal
 
@@ -11,7 +11,7 @@ import fsspec
 import yaml
 from google.adk.tools.tool_context import ToolContext
 from google.genai import types
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from contractor.tools.openapi.models import (
     PathItem,
@@ -20,12 +20,22 @@ from contractor.tools.openapi.models import (
     SecurityScheme,
 )
 from contractor.tools.result import aguard
-from contractor.utils import DictDiff, deep_merge, dict_diff
+from contractor.utils import DictDiff, dict_diff, merge_diff
 
 COMPONENT_KEY_ERROR: Final[str] = "got key={key} but only keys {keys} are allowed"
 ALLOWED_COMPONENT_KEYS: Final[frozenset[str]] = frozenset(
     {"schemas", "securitySchemes", "requestBodies", "headers", "responses"}
 )
+_ALLOWED_COMPONENT_KEYS_TEXT: Final[str] = ",".join(sorted(ALLOWED_COMPONENT_KEYS))
+# Component buckets whose definitions are validated against a pydantic model;
+# the rest ("schemas", "headers") are accepted as-is.
+COMPONENT_MODELS: Final[dict[str, type[BaseModel]]] = {
+    "securitySchemes": SecurityScheme,
+    "requestBodies": RequestBody,
+    "responses": Response,
+}
+# Evidence files with these extensions are rejected by validate_files.
+BANNED_EVIDENCE_EXTENSIONS: Final[tuple[str, ...]] = (".json", ".md", ".yaml", ".yml")
 COMPONENT_VALIDATION_ERROR: Final[str] = (
     "{exception}\n{component} should be formatted as:\n{schema}"
 )
@@ -51,6 +61,81 @@ SERVER_ALREADY_EXISTS: Final[str] = "Server with url {url} already exists."
 
 SERVER_NOT_EXISTS: Final[str] = "Server with url {url} is not exists."
 
+# YAML is still read (seed artifacts, artifacts from older runs) and rendered
+# for display; use the libyaml-backed safe loader/dumper when PyYAML was built
+# with it.
+_YAML_LOADER: Final[type] = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER: Final[type] = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _yaml_dump(value: Any) -> str:
+    return yaml.dump(
+        value,
+        Dumper=_YAML_DUMPER,
+        sort_keys=False,
+        allow_unicode=True,
+        default_flow_style=False,
+    )
+
+
+# Characters JSON leaves raw but a YAML reader rejects (C1 controls,
+# surrogates, U+FFFE/U+FFFF) or folds as line breaks (NEL, U+2028/U+2029).
+# They only occur inside JSON strings, so escaping them keeps the text valid
+# JSON. ``ensure_ascii`` is not an option: PyYAML reads an escaped surrogate
+# pair back as two lone surrogates.
+_YAML_UNSAFE_CHARS_RE: Final[re.Pattern[str]] = re.compile(
+    "[\x7f-\x9f\u2028\u2029\ud800-\udfff\ufffe\uffff]"
+)
+
+
+# PyYAML implements YAML 1.1, which differs from JSON in two ways the
+# artifact can hit: a float needs a "." to resolve as one (``1e+20`` loads as
+# a string, ``1.0e+20`` as a float), and a plain key may not exceed 1024
+# characters. In ``indent=2`` output every number and key starts its own line,
+# so both are found line by line without touching string contents.
+_JSON_KEY: Final[str] = r'"(?:[^"\\\n]|\\.)*": '
+_DOTLESS_EXPONENT_RE: Final[re.Pattern[str]] = re.compile(
+    rf"^( *(?:{_JSON_KEY})?-?\d+)(e[-+]\d+,?)$", re.MULTILINE
+)
+_LONG_KEY_RE: Final[re.Pattern[str]] = re.compile(
+    r'^ *"(?:[^"\\\n]|\\.){1000,}": ', re.MULTILINE
+)
+
+
+# The artifact itself is stored as indented JSON: it is written on every edit
+# and parsed on every tool call, and JSON does both several times faster than
+# YAML. The text stays line-oriented for the linter's snippets. It is kept
+# loadable by YAML 1.1 readers too (the exported file, ``yaml.safe_load``),
+# but code in this repo reads it through ``parse_openapi_text``.
+def _dump_artifact_text(schema: dict[str, Any]) -> str:
+    try:
+        text = json.dumps(schema, ensure_ascii=False, indent=2, allow_nan=False)
+    except (TypeError, ValueError):
+        # YAML-only scalars (dates from seed specs, NaN) have no JSON form;
+        # keep them typed by writing YAML, which _parse_artifact_text reads.
+        return _yaml_dump(schema)
+    if _LONG_KEY_RE.search(text):
+        # The YAML dumper writes such keys in explicit "? key" form.
+        return _yaml_dump(schema)
+    text = _DOTLESS_EXPONENT_RE.sub(r"\1.0\2", text)
+    return _YAML_UNSAFE_CHARS_RE.sub(lambda m: f"\\u{ord(m[0]):04x}", text)
+
+
+def _parse_artifact_text(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return yaml.load(text, Loader=_YAML_LOADER)
+
+
+def parse_openapi_text(text: str) -> Any:
+    """Parse the text of an OpenAPI artifact written by ``OpenApiArtifact``.
+
+    The artifact is JSON, or YAML when written by an older run or seeded from
+    a spec; use this rather than ``yaml.safe_load`` to read it.
+    """
+    return _parse_artifact_text(text)
+
 
 openapi_base_schema: Final[dict[str, Any]] = {
     "openapi": "3.0.3",
@@ -74,6 +159,18 @@ openapi_base_schema: Final[dict[str, Any]] = {
 }
 
 
+def _new_base_schema() -> dict[str, Any]:
+    """Fresh copy of ``openapi_base_schema`` — every container is empty or
+    flat, so one level of copying is a full copy and deepcopy is not needed.
+    """
+    return {
+        **openapi_base_schema,
+        "info": dict(openapi_base_schema["info"]),
+        "paths": {},
+        "components": {key: {} for key in openapi_base_schema["components"]},
+    }
+
+
 @dataclass
 class OpenAPIFormat:
     # Fed by the agents' shared output-format knob. "yaml" has dedicated
@@ -83,12 +180,7 @@ class OpenAPIFormat:
 
     def format_result(self, value: Any) -> Any:
         if self._format == "yaml":
-            return yaml.safe_dump(
-                value,
-                sort_keys=False,
-                allow_unicode=True,
-                default_flow_style=False,
-            )
+            return _yaml_dump(value)
         return value
 
 
@@ -98,14 +190,22 @@ class OpenApiArtifact:
     schema: dict[str, Any] = field(default_factory=dict)
     version: int | None = None
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
+    # Artifact text ``schema`` was parsed from (or last saved as). Every tool
+    # call reloads the artifact; an unchanged text skips the parse, so
+    # callers must treat the loaded schema as read-only and go through
+    # update_schema / modify_schema_locked to change it.
+    _loaded_text: str | None = field(default=None, init=False, repr=False)
+    # (artifact text, its ``dump()``) for the last schema rendered as YAML.
+    _rendered: tuple[str, str] | None = field(default=None, init=False, repr=False)
+    # (servers list, url -> position) for the last list indexed. Edits
+    # replace the servers list rather than mutate it, so identity is enough
+    # to tell the index is current.
+    _server_index: tuple[list[Any], dict[str, int]] | None = field(
+        default=None, init=False, repr=False
+    )
 
     def dump(self) -> str:
-        return yaml.safe_dump(
-            self.schema,
-            sort_keys=False,
-            allow_unicode=True,
-            default_flow_style=False,
-        )
+        return _yaml_dump(self.schema)
 
     def meta(self) -> dict[str, Any]:
         return {"version": self.version or 0}
@@ -113,19 +213,43 @@ class OpenApiArtifact:
     def openapi_key(self) -> str:
         return f"user:oas-{self.name}"
 
+    def server_index(self, servers: list[dict[str, Any]]) -> dict[str, int]:
+        """Map each server url in *servers* to its first position.
+
+        Entries without a string ``url`` are left out; callers only look up
+        stripped url strings.
+        """
+        cached = self._server_index
+        if cached is None or cached[0] is not servers:
+            index: dict[str, int] = {}
+            for position, server in enumerate(servers):
+                url = server.get("url")
+                if isinstance(url, str):
+                    index.setdefault(url, position)
+            cached = self._server_index = (servers, index)
+        return cached[1]
+
     async def _save_schema_locked(self, ctx: ToolContext) -> int:
-        artifact = types.Part.from_text(text=self.dump())
+        text = _dump_artifact_text(self.schema)
+        artifact = types.Part.from_text(text=text)
         meta = self.meta()
+        # Force a reparse on the next load should the save not land.
+        self._loaded_text = None
         self.version = await ctx.save_artifact(self.openapi_key(), artifact, meta)
+        self._loaded_text = text
         return self.version
 
     async def _load_schema_locked(self, ctx: ToolContext) -> dict[str, Any]:
         artifact = await ctx.load_artifact(filename=self.openapi_key())
         if artifact is None:
-            self.schema = copy.deepcopy(openapi_base_schema)
+            self._loaded_text = None
+            self.schema = _new_base_schema()
             return self.schema
 
-        self.schema = yaml.safe_load(artifact.text or "")
+        text = artifact.text or ""
+        if text != self._loaded_text:
+            self.schema = _parse_artifact_text(text)
+            self._loaded_text = text
         return self.schema
 
     async def save_schema(self, ctx: ToolContext) -> int:
@@ -136,13 +260,41 @@ class OpenApiArtifact:
         async with self._lock:
             return await self._load_schema_locked(ctx)
 
-    async def update_schema(self, diff: dict[str, Any], ctx: ToolContext) -> DictDiff:
+    async def load_schema_text(self, ctx: ToolContext) -> str:
+        """Load the schema and return it as ``dump()`` would render it.
+
+        The rendering is kept with the artifact text it was made from, so
+        reading an unchanged artifact again does not serialise it again.
+        """
         async with self._lock:
             await self._load_schema_locked(ctx)
+            text, rendered = self._loaded_text, self._rendered
+            if text is not None and rendered is not None and rendered[0] == text:
+                return rendered[1]
+            dumped = self.dump()
+            if text is not None:
+                self._rendered = (text, dumped)
+            return dumped
+
+    async def update_schema(
+        self,
+        diff: dict[str, Any],
+        ctx: ToolContext,
+        *,
+        copy_values: bool = True,
+    ) -> DictDiff:
+        """Merge *diff* into the stored schema and save it.
 
-            schema = copy.deepcopy(self.schema)
-            schema = deep_merge(schema, diff)
-            schema_diff: DictDiff = dict_diff(self.schema, schema)
+        ``copy_values=False`` stores *diff*'s values by reference; pass it only
+        when *diff* was built for this call and is not used afterwards.
+        """
+        async with self._lock:
+            await self._load_schema_locked(ctx)
+
+            # merge_diff copies only the branches it writes into and diffs
+            # only those, so the rest of the schema is not walked at all.
+            schema = dict(self.schema)
+            schema_diff: DictDiff = merge_diff(schema, diff, copy_values=copy_values)
 
             self.schema = schema
 
@@ -157,16 +309,18 @@ class OpenApiArtifact:
     ) -> DictDiff:
         """Atomically load → modify → diff → save, all under one lock.
 
-        ``modifier`` mutates the working schema dict in place; it raises to
-        reject the change (nothing is saved — ``aguard`` at the tool boundary
-        turns the raise into an ``{"error": ...}`` envelope). Mirrors
-        ``update_schema``'s atomicity for the non-merge mutators (remove/set/
-        add) so concurrent tool calls can't lose each other's writes.
+        ``modifier`` edits a shallow copy of the schema in place; it must
+        replace (not mutate) any nested container it changes, since those are
+        still shared with the loaded schema. It raises to reject the change
+        (nothing is saved — ``aguard`` at the tool boundary turns the raise
+        into an ``{"error": ...}`` envelope). Mirrors ``update_schema``'s
+        atomicity for the non-merge mutators (remove/set/add) so concurrent
+        tool calls can't lose each other's writes.
         """
         async with self._lock:
             await self._load_schema_locked(ctx)
             before = self.schema
-            working = copy.deepcopy(before)
+            working = dict(before)
             modifier(working)
             schema_diff: DictDiff = dict_diff(before, working)
             self.schema = working
@@ -176,12 +330,18 @@ class OpenApiArtifact:
 
 def validate_model(model, item: dict[str, Any]) -> tuple[bool, str | None]:
     try:
-        model.model_validate(item)
+        # Call the model's prebuilt core validator directly rather than going
+        # through the model_validate classmethod wrapper.
+        model.__pydantic_validator__.validate_python(item)
 
     except ValidationError as exc:
         formatted_errors = []
 
-        for err in exc.errors():
+        # Only loc/msg/type are reported; skip building the docs URL, the
+        # echoed input and the ctx dict for every error.
+        for err in exc.errors(
+            include_url=False, include_input=False, include_context=False
+        ):
             loc = ".".join(str(x) for x in err["loc"])
             msg = err["msg"]
             typ = err["type"]
@@ -208,14 +368,12 @@ def validate_model(model, item: dict[str, Any]) -> tuple[bool, str | None]:
 def validate_files(
     files: list[str],
     fs: fsspec.AbstractFileSystem,
-    ext: list[str] | None = None,
+    ext: Sequence[str] = BANNED_EVIDENCE_EXTENSIONS,
 ) -> str | None:
-    if ext is None:
-        ext = [".json", ".md", ".yaml", ".yml"]
     if not files:
         return FILE_VALIDATION_NO_FILES_PROVIDED
 
-    banned_ext = tuple(ext)
+    banned_ext = ext if isinstance(ext, tuple) else tuple(ext)
     banned = [f for f in files if f.endswith(banned_ext)]
 
     if banned:
@@ -233,8 +391,7 @@ def validate_files(
 def validate_component_key(key: str) -> str | None:
     """Return an error message if ``key`` isn't a valid component bucket, else None."""
     if key not in ALLOWED_COMPONENT_KEYS:
-        keys = ",".join(sorted(ALLOWED_COMPONENT_KEYS))
-        return COMPONENT_KEY_ERROR.format(key=key, keys=keys)
+        return COMPONENT_KEY_ERROR.format(key=key, keys=_ALLOWED_COMPONENT_KEYS_TEXT)
     return None
 
 
@@ -284,11 +441,19 @@ def openapi_tools(
 
             pdef = path_def
             if not isinstance(pdef, dict):
-                pdef = pdef.model_dump(by_alias=True, exclude_none=True)
+                # Straight to the model's core serializer, as validate_model
+                # does for validation, skipping model_dump's wrapper.
+                pdef = pdef.__pydantic_serializer__.to_python(
+                    pdef, by_alias=True, exclude_none=True
+                )
             pdef.update({"x-path-files": path_files})
 
+            # The tool-call payload is owned by this call: merge it as is
+            # instead of deep-copying it into the schema.
             diff = {"paths": {path.strip(): pdef}}
-            schema_diff: DictDiff = await oas.update_schema(diff, tool_context)
+            schema_diff: DictDiff = await oas.update_schema(
+                diff, tool_context, copy_values=False
+            )
             return {"result": asdict(schema_diff)}
 
         return await aguard(_impl)
@@ -304,12 +469,14 @@ def openapi_tools(
             def _modify(schema: dict[str, Any]) -> None:
                 # Stored stripped by upsert_path; strip here too so a path with
                 # surrounding whitespace can be removed.
-                paths = schema.get("paths", {})
-                if path.strip() not in paths:
+                path_key = path.strip()
+                paths = dict(schema.get("paths", {}))
+                if path_key not in paths:
                     raise ValueError(
                         PATH_NOT_FOUND_OR_ALREADY_REMOVED.format(path=path)
                     )
-                del paths[path.strip()]
+                del paths[path_key]
+                schema["paths"] = paths
 
             diff = await oas.modify_schema_locked(tool_context, _modify)
             return {"result": asdict(diff)}
@@ -325,8 +492,7 @@ def openapi_tools(
 
         async def _impl() -> dict[str, Any]:
             schema = await oas.load_schema(tool_context)
-            schema.setdefault("paths", {})
-            return {"result": list(schema["paths"].keys())}
+            return {"result": list(schema.get("paths", {}).keys())}
 
         return await aguard(_impl)
 
@@ -339,15 +505,16 @@ def openapi_tools(
         """
 
         async def _impl() -> dict[str, Any]:
+            path_key = path.strip()
             schema = await oas.load_schema(tool_context)
-            schema.setdefault("paths", {})
+            paths = schema.get("paths", {})
 
-            if path.strip() not in schema["paths"]:
+            if path_key not in paths:
                 return {
-                    "error": PATH_NOT_FOUND_OR_ALREADY_REMOVED.format(path=path.strip())
+                    "error": PATH_NOT_FOUND_OR_ALREADY_REMOVED.format(path=path_key)
                 }
 
-            return {"result": fmt.format_result(schema["paths"][path.strip()])}
+            return {"result": fmt.format_result(paths[path_key])}
 
         return await aguard(_impl)
 
@@ -390,26 +557,20 @@ def openapi_tools(
             if err := validate_files(component_files, fs):
                 return {"error": err}
 
-            match key:
-                case "securitySchemes":
-                    ok, err = validate_model(SecurityScheme, component_def)
-                    if not ok:
-                        return {"error": err}
-                case "requestBodies":
-                    ok, err = validate_model(RequestBody, component_def)
-                    if not ok:
-                        return {"error": err}
-                case "responses":
-                    ok, err = validate_model(Response, component_def)
-                    if not ok:
-                        return {"error": err}
+            model = COMPONENT_MODELS.get(key)
+            if model is not None:
+                ok, err = validate_model(model, component_def)
+                if not ok:
+                    return {"error": err}
 
             if type(component_def) is not dict:
                 return {"error": COMPONENT_SHOULD_BE_DICT_NOT_STR}
 
             component_def.update({"x-component-files": component_files})
             diff = {"components": {key: {name: component_def}}}
-            schema_diff: DictDiff = await oas.update_schema(diff, tool_context)
+            schema_diff: DictDiff = await oas.update_schema(
+                diff, tool_context, copy_values=False
+            )
             return {"result": asdict(schema_diff)}
 
         return await aguard(_impl)
@@ -430,9 +591,12 @@ def openapi_tools(
 
         async def _impl() -> dict[str, Any]:
             def _modify(schema: dict[str, Any]) -> None:
-                components = schema.get("components", {})
+                components = dict(schema.get("components", {}))
                 if key in components and component_name in components.get(key, {}):
-                    del components[key][component_name]
+                    group = dict(components[key])
+                    del group[component_name]
+                    components[key] = group
+                    schema["components"] = components
                     return
                 raise ValueError(
                     COMPONENT_NOT_FOUND_OR_ALREADY_REMOVED.format(
@@ -462,10 +626,9 @@ def openapi_tools(
                 return {"error": err}
 
             schema = await oas.load_schema(tool_context)
-            schema.setdefault("components", {})
-            schema["components"].setdefault(key, {})
+            components = schema.get("components", {}).get(key, {})
 
-            return {"result": list(schema["components"][key].keys())}
+            return {"result": list(components.keys())}
 
         return await aguard(_impl)
 
@@ -553,8 +716,7 @@ def openapi_tools(
 
         async def _impl() -> dict[str, Any]:
             schema = await oas.load_schema(tool_context)
-            schema.setdefault("info", {})
-            return {"result": fmt.format_result(schema["info"])}
+            return {"result": fmt.format_result(schema.get("info", {}))}
 
         return await aguard(_impl)
 
@@ -570,10 +732,14 @@ def openapi_tools(
 
         async def _impl() -> dict[str, Any]:
             def _modify(schema: dict[str, Any]) -> None:
-                servers = schema.setdefault("servers", [])
-                if any(url.strip() == server.get("url") for server in servers):
-                    raise ValueError(SERVER_ALREADY_EXISTS.format(url=url.strip()))
-                servers.append({"url": url.strip(), "description": description or ""})
+                url_key = url.strip()
+                servers = schema.get("servers", [])
+                if url_key in oas.server_index(servers):
+                    raise ValueError(SERVER_ALREADY_EXISTS.format(url=url_key))
+                schema["servers"] = [
+                    *servers,
+                    {"url": url_key, "description": description or ""},
+                ]
 
             diff = await oas.modify_schema_locked(tool_context, _modify)
             return {"result": asdict(diff)}
@@ -593,12 +759,21 @@ def openapi_tools(
 
         async def _impl() -> dict[str, Any]:
             def _modify(schema: dict[str, Any]) -> None:
-                servers = schema.setdefault("servers", [])
-                if not any(url.strip() == server.get("url") for server in servers):
-                    raise ValueError(SERVER_NOT_EXISTS.format(url=url.strip()))
-                schema["servers"] = [
-                    server for server in servers if server.get("url") != url.strip()
-                ]
+                url_key = url.strip()
+                servers = schema.get("servers", [])
+                index = oas.server_index(servers)
+                position = index.get(url_key)
+                if position is None:
+                    raise ValueError(SERVER_NOT_EXISTS.format(url=url_key))
+                if len(index) == len(servers):
+                    # Urls are unique (add_server keeps them so): cut the one
+                    # entry out. The list is shared with the loaded schema, so
+                    # build the new one rather than ``del`` in place.
+                    schema["servers"] = servers[:position] + servers[position + 1 :]
+                else:
+                    schema["servers"] = [
+                        server for server in servers if server.get("url") != url_key
+                    ]
 
             diff = await oas.modify_schema_locked(tool_context, _modify)
             return {"result": asdict(diff)}
@@ -614,8 +789,7 @@ def openapi_tools(
 
         async def _impl() -> dict[str, Any]:
             schema = await oas.load_schema(tool_context)
-            schema.setdefault("servers", [])
-            return {"result": schema["servers"]}
+            return {"result": schema.get("servers", [])}
 
         return await aguard(_impl)
 
@@ -631,8 +805,7 @@ def openapi_tools(
         """
 
         async def _impl() -> dict[str, Any]:
-            await oas.load_schema(tool_context)
-            return {"result": oas.dump()}
+            return {"result": await oas.load_schema_text(tool_context)}
 
         return await aguard(_impl)
 
@@ -77,6 +77,17 @@ def _name_token(key: str) -> str:
     return hashlib.sha1(key.encode()).hexdigest()[:16]
 
 
+def _decode_output(raw: bytes) -> str:
+    """Decode captured exec output, truncated to ``_MAX_OUTPUT_CHARS``.
+
+    Only the bytes that can reach the limit are decoded (a char is at most 4
+    UTF-8 bytes), undecodable bytes are replaced instead of raising, and
+    newlines are translated as ``text=True`` would.
+    """
+    text = raw[: _MAX_OUTPUT_CHARS * 4].decode("utf-8", "replace")
+    return text.replace("\r\n", "\n").replace("\r", "\n")[:_MAX_OUTPUT_CHARS]
+
+
 def _safe(key: str) -> str:
     """Sanitise a key for use inside an artifact path."""
     return "".join(c if c.isalnum() or c in "-_." else "-" for c in key) or "default"
@@ -109,6 +120,10 @@ class KaliSandbox:
         self._started = False
         self._lock = threading.Lock()
         self._seq = 0
+        # Workdir listing taken after the last command. Only this sandbox's
+        # commands write there, so it stands in for the next command's
+        # "before" listing and saves a `podman exec` per call.
+        self._workdir_files: set[str] | None = None
 
     # ── lifecycle ────────────────────────────────────────────────────────
     def ensure_started(self) -> None:
@@ -117,11 +132,10 @@ class KaliSandbox:
                 return
             if not shutil.which("podman"):
                 raise SandboxError("podman not found on PATH")
-            # Drop any stale container with the same name.
-            subprocess.run(["podman", "rm", "-f", self.name],
-                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            # --replace drops any stale container with the same name as part
+            # of the run, instead of a separate `podman rm -f` beforehand.
             cmd = [
-                "podman", "run", "-d", "--rm", "--name", self.name,
+                "podman", "run", "-d", "--rm", "--replace", "--name", self.name,
                 "--network", "host",
                 "--memory", self.memory, "--cpus", self.cpus,
                 "--pids-limit", str(self.pids_limit),
@@ -146,6 +160,7 @@ class KaliSandbox:
             subprocess.run(["podman", "rm", "-f", self.name],
                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
             self._started = False
+            self._workdir_files = None
             logger.info("sandbox %s removed", self.name)
 
     # ── exec helpers ─────────────────────────────────────────────────────
@@ -170,9 +185,15 @@ class KaliSandbox:
                              capture_output=True)
         return res.stdout[:_MAX_FILE_BYTES]
 
+    def _workdir_before(self) -> set[str]:
+        if self._workdir_files is None:
+            self._workdir_files = self._list_workdir()
+        return self._workdir_files
+
     def _collect_new_files(self, before: set[str], skip: set[str]) -> list[File]:
         files: list[File] = []
-        for path in sorted(self._list_workdir() - before - skip):
+        after = self._workdir_files = self._list_workdir()
+        for path in sorted(after - before - skip):
             if len(files) >= _MAX_OUTPUT_FILES:
                 break
             data = self._read_file(path)
@@ -188,12 +209,12 @@ class KaliSandbox:
         full = ["podman", "exec", self.name,
                 "timeout", "--signal=KILL", str(timeout_s), *argv]
         try:
-            res = subprocess.run(full, capture_output=True, text=True,
+            res = subprocess.run(full, capture_output=True,
                                  timeout=timeout_s + 15)
         except subprocess.TimeoutExpired:
             return 124, "", f"sandbox exec exceeded {timeout_s}s wall-clock"
-        out = res.stdout[:_MAX_OUTPUT_CHARS]
-        err = res.stderr[:_MAX_OUTPUT_CHARS]
+        out = _decode_output(res.stdout)
+        err = _decode_output(res.stderr)
         if res.returncode == 124:
             err = (err + f"\n[timed out after {timeout_s}s]").strip()
         return res.returncode, out, err
@@ -209,7 +230,7 @@ class KaliSandbox:
             body += "# --- preinit ---\n" + "\n".join(preinit) + "\n\n"
         body += "# --- script ---\n" + code + "\n"
         self._write_file(script_name, body)
-        before = self._list_workdir()
+        before = self._workdir_before()
         rc, out, err = self._exec(["python3", script_name], timeout_s)
         output_files = self._collect_new_files(before, skip={script_name})
         result = _ExecResult(
@@ -219,7 +240,7 @@ class KaliSandbox:
     def run_bash(self, command: str, timeout_s: int) -> _ExecResult:
         self.ensure_started()
         self._seq += 1  # share the run_python sequence so artifacts stay ordered
-        before = self._list_workdir()
+        before = self._workdir_before()
         rc, out, err = self._exec(["sh", "-c", command], timeout_s)
         output_files = self._collect_new_files(before, skip=set())
         return _ExecResult(
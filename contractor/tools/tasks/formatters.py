@@ -22,6 +22,14 @@ from contractor.tools.tasks.models import (
 # be code-fence-wrapped — preserving the caller's narrower type.
 _T = TypeVar("_T")
 
+# libyaml's emitter when PyYAML was built with it; same output, several times
+# faster than the pure-Python SafeDumper.
+_YAML_DUMPER: type = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _yaml_dump(payload: dict[str, Any]) -> str:
+    return yaml.dump(payload, Dumper=_YAML_DUMPER, sort_keys=False)
+
 
 def _stringify_formatted(value: str | dict[str, Any]) -> str:
     if isinstance(value, dict):
@@ -45,23 +53,32 @@ class SubtaskFormatter:
         repr=False,
     )
 
+    # Renderers bound once from ``_format`` so formatting a subtask or result
+    # is a single call rather than a per-call dispatch table.
+    _render_subtask: Callable[..., str | dict[str, Any]] = field(
+        init=False, repr=False, compare=False
+    )
+    _render_result: Callable[..., str | dict[str, Any]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._render_subtask = {
+            "markdown": self._subtask_to_markdown,
+            "yaml": self._subtask_to_yaml,
+            "xml": self._subtask_to_xml,
+        }.get(self._format, self._subtask_to_json)
+        self._render_result = {
+            "markdown": self._subtask_result_to_markdown,
+            "yaml": self._subtask_result_to_yaml,
+            "xml": self._subtask_result_to_xml,
+        }.get(self._format, self._subtask_result_to_json)
+
     @property
     def format(self) -> str:
         """Public read-only accessor for the active output format."""
         return self._format
 
-    # ── Internal dispatcher ─────────────────────────────────────────
-    def _dispatch(
-        self,
-        formatters: dict[str, Callable[..., Any]],
-        *args: Any,
-        type_hint: bool = False,
-        **kwargs: Any,
-    ) -> str | dict[str, Any]:
-        formatter = formatters.get(self._format, formatters["json"])
-        output = formatter(*args, **kwargs)
-        return self._type_hint(output, type_hint)
-
     # ── Subtask formatters ──────────────────────────────────────────
     @staticmethod
     def _subtask_to_json(subtask: Subtask, **kwargs: Any) -> dict[str, Any]:
@@ -76,16 +93,17 @@ class SubtaskFormatter:
         )
 
     @staticmethod
-    def _subtask_to_yaml(subtask: Subtask, **kwargs: Any) -> str:
-        payload = {
-            f"task_{subtask.task_id}": {
-                "task_id": subtask.task_id,
-                "title": subtask.title,
-                "description": subtask.description,
-                "status": subtask.status,
-            }
+    def _subtask_yaml_entry(subtask: Subtask) -> tuple[str, dict[str, Any]]:
+        return f"task_{subtask.task_id}", {
+            "task_id": subtask.task_id,
+            "title": subtask.title,
+            "description": subtask.description,
+            "status": subtask.status,
         }
-        return yaml.safe_dump(payload, sort_keys=False)
+
+    @classmethod
+    def _subtask_to_yaml(cls, subtask: Subtask, **kwargs: Any) -> str:
+        return _yaml_dump(dict([cls._subtask_yaml_entry(subtask)]))
 
     @staticmethod
     def _subtask_to_xml(subtask: Subtask, indent: int = 0, **kwargs: Any) -> str:
@@ -123,18 +141,21 @@ class SubtaskFormatter:
         )
 
     @staticmethod
+    def _subtask_result_yaml_entry(
+        subtask_result: SubtaskExecutionResult,
+    ) -> tuple[str, dict[str, Any]]:
+        return f"result_{subtask_result.task_id}", {
+            "task_id": subtask_result.task_id,
+            "status": subtask_result.status,
+            "output": subtask_result.output,
+            "summary": subtask_result.summary,
+        }
+
+    @classmethod
     def _subtask_result_to_yaml(
-        subtask_result: SubtaskExecutionResult, **kwargs: Any
+        cls, subtask_result: SubtaskExecutionResult, **kwargs: Any
     ) -> str:
-        payload = {
-            f"result_{subtask_result.task_id}": {
-                "task_id": subtask_result.task_id,
-                "status": subtask_result.status,
-                "output": subtask_result.output,
-                "summary": subtask_result.summary,
-            }
-        }
-        return yaml.safe_dump(payload, sort_keys=False)
+        return _yaml_dump(dict([cls._subtask_result_yaml_entry(subtask_result)]))
 
     @staticmethod
     def _subtask_result_to_xml(
@@ -155,6 +176,14 @@ class SubtaskFormatter:
         )
 
     # ── Helpers ─────────────────────────────────────────────────────
+    @staticmethod
+    def _yaml_batch(entries: list[tuple[str, dict[str, Any]]]) -> str | None:
+        """Dump all entries as one mapping, or None if two share a key."""
+        payload = dict(entries)
+        if len(payload) != len(entries):
+            return None
+        return _yaml_dump(payload)
+
     def _type_hint(
         self,
         output: _T,
@@ -168,25 +197,22 @@ class SubtaskFormatter:
     def format_subtask(
         self, subtask: Subtask, type_hint: bool = False, **kwargs: Any
     ) -> str | dict[str, Any]:
-        formatters: dict[str, Callable[..., Any]] = {
-            "json": self._subtask_to_json,
-            "markdown": self._subtask_to_markdown,
-            "yaml": self._subtask_to_yaml,
-            "xml": self._subtask_to_xml,
-        }
-        return self._dispatch(formatters, subtask, type_hint=type_hint, **kwargs)
+        return self._type_hint(self._render_subtask(subtask, **kwargs), type_hint)
 
     def format_subtasks(
         self, subtasks: list[Subtask], type_hint: bool = False
     ) -> str | list[dict[str, Any]]:
-        if self._format in {"markdown", "yaml"}:
-            output = "\n".join(
-                str(self.format_subtask(subtask)) for subtask in subtasks
-            )
+        if self._format == "yaml":
+            batch = self._yaml_batch([self._subtask_yaml_entry(s) for s in subtasks])
+            if batch is None:
+                batch = "\n".join([self._subtask_to_yaml(s) for s in subtasks])
+            return self._type_hint(batch, type_hint)
+        if self._format == "markdown":
+            output = "\n".join([self._subtask_to_markdown(s) for s in subtasks])
             return self._type_hint(output, type_hint)
         if self._format == "xml":
             inner = "\n".join(
-                str(self.format_subtask(subtask, indent=1)) for subtask in subtasks
+                [self._subtask_to_xml(subtask, indent=1) for subtask in subtasks]
             )
             output = f"<subtasks>\n{inner}\n</subtasks>"
             return self._type_hint(output, type_hint)
@@ -198,27 +224,31 @@ class SubtaskFormatter:
         type_hint: bool = False,
         **kwargs: Any,
     ) -> str | dict[str, Any]:
-        formatters: dict[str, Callable[..., Any]] = {
-            "json": self._subtask_result_to_json,
-            "markdown": self._subtask_result_to_markdown,
-            "yaml": self._subtask_result_to_yaml,
-            "xml": self._subtask_result_to_xml,
-        }
-        return self._dispatch(formatters, subtask_result, type_hint=type_hint, **kwargs)
+        output = self._render_result(subtask_result, **kwargs)
+        return self._type_hint(output, type_hint)
 
     def format_subtask_results(
         self,
         subtask_results: list[SubtaskExecutionResult],
         type_hint: bool = False,
     ) -> str | list[dict[str, Any]]:
-        if self._format in {"markdown", "yaml"}:
+        if self._format == "yaml":
+            batch = self._yaml_batch(
+                [self._subtask_result_yaml_entry(r) for r in subtask_results]
+            )
+            if batch is None:
+                batch = "\n".join(
+                    [self._subtask_result_to_yaml(r) for r in subtask_results]
+                )
+            return self._type_hint(batch, type_hint)
+        if self._format == "markdown":
             output = "\n".join(
-                str(self.format_subtask_result(r)) for r in subtask_results
+                [self._subtask_result_to_markdown(r) for r in subtask_results]
             )
             return self._type_hint(output, type_hint)
         if self._format == "xml":
             inner = "\n".join(
-                str(self.format_subtask_result(r, indent=1)) for r in subtask_results
+                [self._subtask_result_to_xml(r, indent=1) for r in subtask_results]
             )
             output = f"<results>\n{inner}\n</results>"
             return self._type_hint(output, type_hint)
@@ -305,7 +335,9 @@ class SubtaskFormatter:
             return f"\n<observations>\n{inner}\n</observations>"
         if self._format == "yaml":
             payload = {"observations": dict(fields)}
-            return "\n" + yaml.safe_dump(payload, sort_keys=False, allow_unicode=True)
+            return "\n" + yaml.dump(
+                payload, Dumper=_YAML_DUMPER, sort_keys=False, allow_unicode=True
+            )
         if self._format == "markdown":
             lines = "\n".join(f"- {k}: {v}" for k, v in fields)
             return f"\n**Observations**\n{lines}\n"
@@ -28,7 +28,7 @@ logger = logging.getLogger(__name__)
 # ═══════════════════════════════════════════════════════════════════
 # StreamlineManager
 # ═══════════════════════════════════════════════════════════════════
-@dataclass
+@dataclass(slots=True)
 class StreamlineManager:
     name: str
     max_tasks: int
@@ -54,24 +54,55 @@ class StreamlineManager:
     # ── ID generation ───────────────────────────────────────────────
     @staticmethod
     def _next_task_id(subtasks: list[Subtask]) -> str:
-        """Return the next root-level task ID (0-based)."""
+        """Return the next root-level task ID (0-based).
+
+        Roots are only ever appended with increasing IDs and decomposition
+        inserts children right after their parent, so the last subtask always
+        belongs to the highest root.
+        """
         if not subtasks:
             return "0"
-        max_root = max(int(s.task_id.split(".")[0]) for s in subtasks)
-        return str(max_root + 1)
+        last_root = int(subtasks[-1].task_id.split(".", 1)[0])
+        return str(last_root + 1)
 
     # ── Subtask persistence ─────────────────────────────────────────
-    def get_subtasks(self, ctx: ToolContext | CallbackContext) -> list[Subtask]:
+    def _stored_subtasks(self, ctx: ToolContext | CallbackContext) -> list[Any]:
         key = self._subtasks_key(ctx)
         ctx.state.setdefault(key, [])
-        return [Subtask(**sub) for sub in ctx.state[key]]
+        return ctx.state[key]
 
-    def _save_subtasks(
-        self,
+    @staticmethod
+    def _load_subtasks(stored: list[Any]) -> list[Subtask]:
+        # Every tool call reloads the whole plan: validate each stored dict
+        # with the model's core validator instead of going through __init__.
+        validate = Subtask.__pydantic_validator__.validate_python
+        return [validate(sub) for sub in stored]
+
+    def get_subtasks(self, ctx: ToolContext | CallbackContext) -> list[Subtask]:
+        return self._load_subtasks(self._stored_subtasks(ctx))
+
+    @staticmethod
+    def _dump_subtasks(
         subtasks: list[Subtask],
-        ctx: ToolContext | CallbackContext,
-    ) -> None:
-        ctx.state[self._subtasks_key(ctx)] = [sub.model_dump() for sub in subtasks]
+        loaded: dict[int, tuple[Subtask, Any, SubtaskStatus]] | None = None,
+    ) -> list[Any]:
+        """Dump ``subtasks`` for state; ``loaded`` maps ``id(subtask)`` to the
+        (subtask, stored dict, loaded status) it was loaded from.
+
+        The manager only ever changes a loaded subtask's status, so a subtask
+        whose status is unchanged is written back as its stored dict instead
+        of being dumped again. Fresh dumps leave out defaults (``status="new"``);
+        loading fills them back in.
+        """
+        loaded = loaded or {}
+        dumped: list[Any] = []
+        for sub in subtasks:
+            source = loaded.get(id(sub))
+            if source is not None and source[0] is sub and source[2] == sub.status:
+                dumped.append(source[1])
+            else:
+                dumped.append(sub.model_dump(exclude_defaults=True))
+        return dumped
 
     @contextmanager
     def _subtasks_session(
@@ -83,9 +114,21 @@ class StreamlineManager:
         On exception, the persisted state is left untouched, which preserves
         the pre-mutation snapshot when a transition fails partway through.
         """
-        subtasks = self.get_subtasks(ctx)
+        stored = list(self._stored_subtasks(ctx))
+        subtasks = self._load_subtasks(stored)
+        # Holds every loaded subtask, so no id() is reused while saving.
+        loaded = {
+            id(sub): (sub, raw, sub.status)
+            for sub, raw in zip(subtasks, stored, strict=True)
+        }
         yield subtasks
-        self._save_subtasks(subtasks, ctx)
+        dumped = self._dump_subtasks(subtasks, loaded)
+        # Refused operations leave the plan as loaded: skip the write, which
+        # ADK would otherwise record as a state delta on the event.
+        if len(dumped) != len(stored) or any(
+            new is not old for new, old in zip(dumped, stored, strict=True)
+        ):
+            ctx.state[self._subtasks_key(ctx)] = dumped
 
     # ── Index helpers ───────────────────────────────────────────────
     def _get_idx(self, ctx: ToolContext | CallbackContext) -> int | None:
@@ -305,8 +348,7 @@ class StreamlineManager:
                     )
                 )
 
-            for i, sub in enumerate(insertion):
-                subtasks.insert(idx + 1 + i, sub)
+            subtasks[idx + 1 : idx + 1] = insertion
 
             parent_record = {
                 **current.model_dump(),
@@ -1,6 +1,6 @@
 from datetime import UTC, datetime
 
-from .dictutils import DictDiff, deep_merge, dict_diff
+from .dictutils import DictDiff, deep_merge, dict_diff, merge_diff
 from .prompt import all_active_prompt_versions, load_prompt, load_prompt_with_version
 
 
@@ -12,6 +12,7 @@ def utc_now_iso() -> str:
 __all__ = [
     "dict_diff",
     "deep_merge",
+    "merge_diff",
     "DictDiff",
     "all_active_prompt_versions",
     "load_prompt",
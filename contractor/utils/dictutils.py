@@ -4,19 +4,27 @@ from dataclasses import asdict, dataclass, field
 from typing import Any
 
 
-def deep_merge(target: dict, diff: dict) -> dict:
+def deep_merge(target: dict, diff: dict, *, copy_values: bool = True) -> dict:
     """
     Deep merge dictionaries. Lists are replaced (not concatenated) to avoid
     duplications and preserve OpenAPI determinism.
+
+    Nested mappings along the merge path are copied before being written, so
+    only *target* itself is mutated: ``deep_merge(dict(d), diff)`` leaves
+    ``d`` untouched without deep-copying it. Values taken from *diff* are
+    deep-copied unless ``copy_values=False``, for callers that hand *diff*
+    over and never touch it again.
     """
 
     for key, value in diff.items():
         if isinstance(value, collections.abc.Mapping) and isinstance(
             target.get(key), collections.abc.Mapping
         ):
-            target[key] = deep_merge(dict(target[key]), dict(value))
+            target[key] = deep_merge(
+                dict(target[key]), dict(value), copy_values=copy_values
+            )
         else:
-            target[key] = copy.deepcopy(value)
+            target[key] = copy.deepcopy(value) if copy_values else value
     return target
 
 
@@ -28,7 +36,11 @@ class DictDiff:
 
 
 def dict_diff(old: dict, new: dict) -> DictDiff:
-    """Structural diff without external dependencies."""
+    """Structural diff without external dependencies.
+
+    Values shared by identity are skipped unvisited, so diffing a
+    copy-on-write edit costs the edited branches, not the whole tree.
+    """
 
     diff: DictDiff = DictDiff()
 
@@ -43,6 +55,8 @@ def dict_diff(old: dict, new: dict) -> DictDiff:
 
     for k in old_keys & new_keys:
         ov, nv = old[k], new[k]
+        if ov is nv:
+            continue
         if isinstance(ov, dict) and isinstance(nv, dict):
             nested = asdict(dict_diff(ov, nv))
             if any(nested.values()):
@@ -50,3 +64,37 @@ def dict_diff(old: dict, new: dict) -> DictDiff:
         elif ov != nv:
             diff.changed[k] = {"from": ov, "to": nv}
     return diff
+
+
+def merge_diff(target: dict, diff: dict, *, copy_values: bool = True) -> DictDiff:
+    """``deep_merge`` *diff* into *target* and return what the merge changed.
+
+    Same merge and same result as ``dict_diff(before, deep_merge(...))``, but
+    only the keys of *diff* are visited: siblings of the edited branches are
+    never walked, however large *target* is.
+    """
+
+    result: DictDiff = DictDiff()
+
+    for key, value in diff.items():
+        if key not in target:
+            new = copy.deepcopy(value) if copy_values else value
+            target[key] = result.added[key] = new
+            continue
+
+        old = target[key]
+        if isinstance(value, collections.abc.Mapping) and isinstance(
+            old, collections.abc.Mapping
+        ):
+            merged = dict(old)
+            nested = asdict(merge_diff(merged, dict(value), copy_values=copy_values))
+            target[key] = merged
+            if any(nested.values()):
+                result.changed[key] = nested
+            continue
+
+        new = copy.deepcopy(value) if copy_values else value
+        target[key] = new
+        if old is not new and old != new:
+            result.changed[key] = {"from": old, "to": new}
+    return result
@@ -1,9 +1,18 @@
+import re
 import unicodedata
 
+_XML_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&apos;"}
+)
+_XML_SPECIAL_RE = re.compile(r"[&<>\"']")
+
 
 def norm_unicode(value: str | None) -> str | None:
     if value is None:
         return None
+    # NFC is the identity on ASCII; most paths never reach the normalizer.
+    if value.isascii() or unicodedata.is_normalized("NFC", value):
+        return value
     return unicodedata.normalize("NFC", value)
 
 
@@ -19,10 +28,7 @@ def normalize_slashes(path: str) -> str:
 
 
 def xml_escape(value: str) -> str:
-    return (
-        value.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&apos;")
-    )
+    # Names and paths rarely carry markup characters; hand those back as-is.
+    if _XML_SPECIAL_RE.search(value) is None:
+        return value
+    return value.translate(_XML_ESCAPES)
@@ -11,7 +11,7 @@ from contractor.agents.trace_agent.agent import build_trace_agent
 from contractor.runners.artifacts import artifact_key_slug
 from contractor.runners.task_runner import TaskRunner, TaskRunnerEventHandler
 from contractor.tools.fs import MemoryOverlayFileSystem
-from contractor.tools.openapi import resolve_refs
+from contractor.tools.openapi import parse_openapi_text, resolve_refs
 from contractor.utils.settings import build_model
 from contractor.workflows import Workflow, WorkflowContext, persist_seed_artifact
 from contractor.workflows.config import WorkflowConfig
@@ -49,7 +49,7 @@ def extract_openapi_paths(
 ) -> list[OpenApiPath]:
     """Extract all paths and their operations from an OpenAPI schema."""
     paths: list[OpenApiPath] = []
-    # Empty / paths-less / non-dict artifacts (e.g. yaml.safe_load("") -> None)
+    # Empty / paths-less / non-dict artifacts (e.g. parse_openapi_text("") -> None)
     # must yield no paths rather than crash with KeyError/AttributeError (audit MEDIUM).
     if not isinstance(openapi, dict) or not isinstance(openapi.get("paths"), dict):
         logger.warning("OpenAPI artifact has no 'paths' mapping; no paths extracted")
@@ -128,7 +128,7 @@ class TraceAnnotationWorkflow(Workflow):
         if not raw:
             raise ValueError("No OpenAPI artifact found")
 
-        openapi = yaml.safe_load(raw.text or "")
+        openapi = parse_openapi_text(raw.text or "")
         self.paths = extract_openapi_paths(openapi=openapi)
 
         fs_state_artifact = await ctx.artifact_service.load_artifact(
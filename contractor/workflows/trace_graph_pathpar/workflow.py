@@ -29,6 +29,7 @@ from contractor.runners.skills import inject_skills
 from contractor.tools.code import attach_graph_tools_if_local
 from contractor.tools.fs import MemoryOverlayFileSystem
 from contractor.tools.fs.merge import fork_overlay, merge_overlay_forks
+from contractor.tools.openapi import parse_openapi_text
 from contractor.utils.settings import build_model
 from contractor.workflows import Workflow, WorkflowContext, persist_seed_artifact
 from contractor.workflows.config import WorkflowConfig
@@ -96,7 +97,7 @@ class TraceGraphPathParWorkflow(Workflow):
         if not raw:
             raise ValueError("No OpenAPI artifact found")
 
-        openapi = yaml.safe_load(raw.text or "")
+        openapi = parse_openapi_text(raw.text or "")
         self.paths = extract_openapi_paths(openapi=openapi)
 
         # Resume: load existing overlay state if present.
@@ -39,6 +39,7 @@ from contractor.runners.plugins.metrics_plugin import AdkMetricsPlugin
 from contractor.runners.plugins.trace_plugin import AdkTracePlugin
 from contractor.runners.skills import inject_skills
 from contractor.tools.fs import MemoryOverlayFileSystem
+from contractor.tools.openapi import parse_openapi_text
 from contractor.utils.settings import build_model
 from contractor.workflows import Workflow, WorkflowContext, persist_seed_artifact
 from contractor.workflows.config import WorkflowConfig
@@ -136,7 +137,7 @@ class TracePostDiffWorkflow(Workflow):
         if not raw:
             raise ValueError("No OpenAPI artifact found")
 
-        openapi = yaml.safe_load(raw.text or "")
+        openapi = parse_openapi_text(raw.text or "")
         self.paths = extract_openapi_paths(openapi=openapi)
 
         # Group by route prefix: the group is the unit of memory namespace,
@@ -23,11 +23,10 @@ import logging
 from functools import partial
 from typing import Any
 
-import yaml
-
 from contractor.agents.trace_verifier_agent.agent import build_trace_verifier_agent
 from contractor.runners.artifacts import artifact_key_slug
 from contractor.runners.task_runner import TaskRunner, TaskRunnerEventHandler
+from contractor.tools.openapi import parse_openapi_text
 from contractor.utils.settings import build_model
 from contractor.workflows import Workflow, WorkflowContext, persist_seed_artifact
 from contractor.workflows.config import WorkflowConfig
@@ -72,7 +71,7 @@ class TraceVerifyWorkflow(Workflow):
         if not raw:
             raise ValueError("No OpenAPI artifact found")
 
-        openapi = yaml.safe_load(raw.text or "")
+        openapi = parse_openapi_text(raw.text or "")
         self.paths = extract_openapi_paths(openapi=openapi)
 
         total_findings = 0
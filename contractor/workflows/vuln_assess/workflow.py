@@ -24,6 +24,7 @@ from contractor.agents.oas_builder_agent.agent import build_oas_builder_agent
 from contractor.agents.oas_linter_agent.agent import build_oas_linter_agent
 from contractor.agents.swe_agent.agent import build_swe_agent
 from contractor.runners.task_runner import TaskRunner, TaskRunnerEventHandler
+from contractor.tools.openapi import parse_openapi_text
 from contractor.utils.settings import build_model, get_settings
 from contractor.workflows import Workflow, WorkflowContext, persist_seed_artifact
 from contractor.workflows.config import WorkflowConfig
@@ -284,7 +285,7 @@ class VulnAssessWorkflow(Workflow):
             if not oas_part:
                 continue
             try:
-                openapi = yaml.safe_load(oas_part.text or "") or {}
+                openapi = parse_openapi_text(oas_part.text or "") or {}
             except yaml.YAMLError:
                 continue
             paths = extract_openapi_paths(openapi=openapi)
@@ -90,6 +90,15 @@ class TestGlobWalkCeiling:
         assert truncated is False
         assert matches == ["/sub/b.py", "/sub/deep/c.py", "/top.py"]
 
+    def test_ceiling_only_counts_files_in_directories_the_pattern_reaches(
+        self, fs
+    ):
+        # 'sub/*.py' never opens sub/deep or scans the root's files, so only
+        # sub/b.py and sub/note.txt count toward the ceiling.
+        matches, truncated = fs.glob_scanned("sub/*.py", max_files=2)
+        assert truncated is False
+        assert matches == ["/sub/b.py"]
+
     def test_default_ceiling_comes_from_settings(self, fs, monkeypatch):
         import cli.fs as cli_fs_module
         from contractor.utils.settings import Settings
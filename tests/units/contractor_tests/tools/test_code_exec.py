@@ -46,6 +46,8 @@ class _FakePodman:
             return mock.Mock(returncode=0, stdout=b"filedata", stderr=b"")
         if not text and kw.get("input") is not None:
             return mock.Mock(returncode=0, stdout=b"", stderr=b"")
+        if not text:
+            out, err = out.encode(), err.encode()
         return mock.Mock(returncode=rc, stdout=out, stderr=err)
 
 
@@ -74,6 +76,15 @@ def test_container_launched_with_isolation_flags(fake_podman):
     assert cmd[-2:] == ["sleep", podman._CONTAINER_TTL]
 
 
+def test_start_replaces_stale_container_in_one_call(fake_podman):
+    sb = KaliSandbox("inv-replace")
+    sb.ensure_started()
+    # no separate `podman rm -f`: the run itself replaces a stale container
+    assert fake_podman.calls == [_run_cmd(fake_podman)]
+    cmd = fake_podman.calls[0]
+    assert "--replace" in cmd and cmd[cmd.index("--name") + 1] == sb.name
+
+
 def test_env_is_scrubbed(fake_podman):
     """No host env passed into the sandbox (no -e / --env-host)."""
     KaliSandbox("inv-env").ensure_started()
@@ -211,6 +222,34 @@ def test_run_bash_propagates_nonzero_exit_code(fake_podman, monkeypatch):
     assert result.exit_code == 3
 
 
+def test_workdir_listing_carries_over_between_commands(fake_podman, monkeypatch):
+    sb = KaliSandbox("inv-ls")
+    listings = iter([set(), {"/work/a.txt"}, {"/work/a.txt", "/work/b.txt"}])
+    monkeypatch.setattr(sb, "ensure_started", lambda: None)
+    monkeypatch.setattr(sb, "_list_workdir", lambda: next(listings))
+    monkeypatch.setattr(sb, "_read_file", lambda path: path.encode())
+    monkeypatch.setattr(sb, "_exec", lambda argv, t: (0, "", ""))
+
+    first = sb.run_bash("touch a.txt", timeout_s=5)
+    second = sb.run_bash("touch b.txt", timeout_s=5)
+
+    assert [f.name for f in first.output_files] == ["a.txt"]
+    assert [f.name for f in second.output_files] == ["b.txt"]
+    assert next(listings, None) is None  # 3 listings for 2 commands
+
+
+def test_exec_output_is_decoded_leniently_and_truncated(fake_podman, monkeypatch):
+    raw = b"ok\r\n\xff" + "\u00e9".encode() * podman._MAX_OUTPUT_CHARS
+    monkeypatch.setattr(
+        podman.subprocess, "run",
+        lambda cmd, **kw: mock.Mock(returncode=0, stdout=raw, stderr=b"\xfe"))
+
+    rc, out, err = KaliSandbox("inv-dec")._exec(["true"], 5)
+    assert rc == 0 and err == "\ufffd"
+    assert out.startswith("ok\n\ufffd\u00e9")
+    assert len(out) == podman._MAX_OUTPUT_CHARS
+
+
 @pytest.mark.skipif(
     not shutil.which("podman")
     or subprocess.run(["podman", "image", "exists", DEFAULT_SANDBOX_IMAGE]).returncode != 0,
@@ -10,12 +10,20 @@ import pytest
 from cli.fs import RootedLocalFileSystem
 from contractor.tools.fs import (
     FileFormat,
+    FsEntry,
     FsspecInteractionFileTools,
     InteractionFilter,
     InteractionKind,
     ro_file_tools,
     rw_file_tools,
 )
+from contractor.tools.fs.const import _IGNORE_DEFAULTS
+from contractor.tools.fs.read_tools import (
+    _GREP_READ_WORKERS,
+    _build_ignore_patterns,
+    _read_if_contains,
+    _required_literal,
+)
 
 
 @pytest.fixture()
@@ -474,6 +482,27 @@ def test_glob_respects_path_filter(tools_json, tmpdir_path: Path):
     assert all(p.startswith(abs_path(tmpdir_path / "src")) for p in paths)
 
 
+def test_glob_resolves_each_distinct_match_once(
+    tools_json, fs, tmpdir_path: Path, monkeypatch
+):
+    a_py = abs_path(tmpdir_path / "src" / "a.py")
+    monkeypatch.setattr(fs, "glob", lambda pattern: [a_py, a_py, a_py])
+
+    calls: list[str] = []
+    original = FsEntry.from_path.__func__
+
+    def counting_from_path(cls, path, fs, **kwargs):
+        calls.append(path)
+        return original(cls, path, fs, **kwargs)
+
+    monkeypatch.setattr(FsEntry, "from_path", classmethod(counting_from_path))
+
+    res = tools_json["glob"]("**/*.py", path=abs_path(tmpdir_path))
+    assert "error" not in res
+    assert [e["path"] for e in res["result"]] == [a_py, a_py, a_py]
+    assert calls == [a_py]
+
+
 def test_glob_relative_pattern_is_rooted_at_path(tools_json, tmpdir_path: Path):
     res = tools_json["glob"]("*.py", path=abs_path(tmpdir_path / "src"))
     assert "error" not in res
@@ -612,6 +641,19 @@ def test_read_file_truncation_footer(fs, tmpdir_path: Path):
     assert "truncated" in res["result"]
 
 
+def test_read_file_window_counts_lines_left_in_whole_file(
+    tools_json, tmpdir_path: Path
+):
+    big = tmpdir_path / "big.txt"
+    big.write_text("".join(f"row {i} é\n" for i in range(5000)), encoding="utf-8")
+
+    page = tools_json["read_file"](abs_path(big), offset=10, limit=3)
+    body = page["result"]
+    assert body.splitlines()[:3] == ["row 10 é", "row 11 é", "row 12 é"]
+    assert "lines left in the file: 4987 ###" in body
+    assert "resume with read_file offset=13 ###" in body
+
+
 def test_grep_invalid_regex(tools_json):
     res = tools_json["grep"]("[unclosed", path=".")
     assert "error" in res
@@ -635,6 +677,131 @@ def test_grep_on_single_file_returns_matches_with_loc(tools_json, tmpdir_path: P
     assert "ERROR: boom" in loc.get("content", "")
 
 
+def test_grep_stats_each_file_once(tools_json, fs, tmpdir_path: Path, monkeypatch):
+    calls: list[str] = []
+    original = fs.info
+
+    def counting_info(path, **kwargs):
+        calls.append(path)
+        return original(path, **kwargs)
+
+    monkeypatch.setattr(fs, "info", counting_info)
+
+    f = abs_path(tmpdir_path / "src" / "a.py")
+    assert tools_json["grep"](r"ERROR", path=f)["total_items"] == 1
+    assert calls == [f]
+
+    # Beyond the walk's own listing, grep stats a matched file once and a
+    # walked file without a match not at all.
+    calls.clear()
+    a_py = abs_path(tmpdir_path / "src" / "a.py")
+    b_txt = abs_path(tmpdir_path / "src" / "b.txt")
+    res = tools_json["grep"](r"gamma", path=abs_path(tmpdir_path / "src"))
+    assert [e["path"] for e in res["result"]] == [b_txt]
+    assert calls.count(b_txt) == 1
+    assert a_py not in calls
+
+
+def test_grep_literal_pattern_matches_like_regex(tools_json, tmpdir_path: Path):
+    f = tmpdir_path / "dash.txt"
+    f.write_text("a-b a-b\nnone\nx a-b\n", encoding="utf-8")
+
+    literal = tools_json["grep"]("a-b", path=abs_path(f))
+    regex = tools_json["grep"](r"a\-b", path=abs_path(f))
+    assert "error" not in literal
+    assert literal["result"] == regex["result"]
+    assert [e["loc"]["line_start"] for e in literal["result"]] == [0, 0, 2]
+
+
+def test_grep_matches_crlf_files_like_read_text(tools_json, tmpdir_path: Path):
+    f = tmpdir_path / "crlf.txt"
+    f.write_bytes(b"foo\r\nbar\r\nfoo\r\n")
+
+    res = tools_json["grep"](r"(?m)foo$", path=abs_path(f))
+    assert "error" not in res
+    assert [e["loc"]["line_start"] for e in res["result"]] == [0, 2]
+    # The "\r" is translated away, so "." cannot swallow it before "$".
+    assert tools_json["grep"](r"(?m)foo.$", path=abs_path(f))["result"] == []
+
+
+@pytest.mark.parametrize(
+    ("pattern", "literal"),
+    [
+        ("hello", "hello"),
+        (r"ERROR:\s+\w+", "ERROR:"),
+        (r"def\s+foo\(", "foo("),
+        (r"import (os|sys)", "import "),
+        (r"colou?r", "colo"),
+        (r"a{2}bc", "bc"),
+        (r"foo|bar", ""),
+        (r"(?i)hello", ""),
+        (r"\x41BC", "BC"),
+        (r"\u0041BC", "BC"),
+        (r"\U00000041BC", "BC"),
+        (r"\101BC", "BC"),
+        (r"\0BC", "BC"),
+        (r"\N{LATIN CAPITAL LETTER A}BC", "BC"),
+        (r"(A)\1BC", "BC"),
+    ],
+)
+def test_required_literal_is_conservative(pattern: str, literal: str):
+    assert _required_literal(pattern) == literal
+
+
+@pytest.mark.parametrize(
+    "pattern", [r"\x41BC", r"\101BC", r"\N{LATIN CAPITAL LETTER A}BC"]
+)
+def test_grep_matches_through_multi_character_escapes(
+    tools_json, tmpdir_path: Path, pattern: str
+):
+    d = tmpdir_path / "escapes"
+    d.mkdir()
+    f = d / "abc.txt"
+    f.write_text("ABC\n", encoding="utf-8")
+
+    assert tools_json["grep"](pattern, path=abs_path(f))["total_items"] == 1
+    assert tools_json["grep"](pattern, path=abs_path(d))["total_items"] == 1
+
+
+def test_build_ignore_patterns_dedups_in_order():
+    extra = ["*.log", "", _IGNORE_DEFAULTS[0], "*.log", "build/*"]
+    assert _build_ignore_patterns(extra) == [*_IGNORE_DEFAULTS, "*.log", "build/*"]
+    assert _build_ignore_patterns(None) == list(_IGNORE_DEFAULTS)
+
+
+def test_read_if_contains_sees_literal_split_across_blocks(
+    fs: fsspec.AbstractFileSystem, tmp_path: Path
+):
+    f = tmp_path / "blocks.txt"
+    f.write_bytes(b"0123456789NEEDLE-tail")
+
+    # "NEEDLE" straddles the 8-byte block boundary; the whole file comes back.
+    assert _read_if_contains(fs, str(f), "NEEDLE", block_size=8) == f.read_bytes()
+    assert _read_if_contains(fs, str(f), "absent", block_size=8) is None
+    assert _read_if_contains(fs, str(f), "") == f.read_bytes()
+
+
+def test_grep_prefilter_sees_literal_joined_by_dropped_bytes(
+    tools_json, fs: fsspec.AbstractFileSystem, tmp_path: Path
+):
+    f = tmp_path / "invalid.txt"
+    f.write_bytes(b"A\xffb\n")
+
+    # grep decodes leniently, so "Ab" matches once the invalid byte is dropped;
+    # the prefilter must judge the same decoded text.
+    assert _read_if_contains(fs, str(f), "Ab", block_size=2) == f.read_bytes()
+    res = tools_json["grep"]("Ab", path=abs_path(f))
+    assert res["total_items"] == 1
+
+
+def test_grep_prefilter_keeps_regex_semantics(tools_json, tmpdir_path: Path):
+    res = tools_json["grep"](r"ERROR:\s+\w+|hello", path=abs_path(tmpdir_path))
+    assert "error" not in res
+    paths = {e["path"] for e in res["result"]}
+    assert abs_path(tmpdir_path / "README.md") in paths
+    assert abs_path(tmpdir_path / "src" / "a.py") in paths
+
+
 def test_grep_directory_walk_finds_across_files(tools_json, tmpdir_path: Path):
     res = tools_json["grep"](r"hello", path=abs_path(tmpdir_path))
     assert "error" not in res
@@ -644,6 +811,34 @@ def test_grep_directory_walk_finds_across_files(tools_json, tmpdir_path: Path):
     assert abs_path(tmpdir_path / "src" / "a.py") in paths
 
 
+def test_grep_walk_reads_every_prefetched_file(tools_json, tmpdir_path: Path):
+    bulk = tmpdir_path / "bulk"
+    bulk.mkdir()
+    for i in range(300):
+        (bulk / f"f{i:03}.txt").write_text(f"needle {i}\n", encoding="utf-8")
+
+    res = tools_json["grep"](r"needle \d+", path=abs_path(bulk))
+    assert "error" not in res
+    assert res["total_items"] == 300
+
+
+def test_read_candidates_bounds_reads_in_flight(
+    interaction_tools: FsspecInteractionFileTools,
+):
+    started: list[str] = []
+
+    def read(path: str) -> bytes:
+        started.append(path)
+        return path.encode()
+
+    paths = [f"/f{i}" for i in range(50)]
+    results = interaction_tools._read_candidates(read, paths)
+    for consumed, (raw, path) in enumerate(zip(results, paths, strict=True), 1):
+        assert raw == path.encode()
+        assert len(started) - consumed <= _GREP_READ_WORKERS
+    assert sorted(started) == sorted(paths)
+
+
 def test_grep_respects_ignored_patterns(tools_json, tmpdir_path: Path):
     res = tools_json["grep"](r".", path=abs_path(tmpdir_path / "src" / "__pycache__"))
     assert "error" not in res
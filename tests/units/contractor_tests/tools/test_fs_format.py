@@ -145,6 +145,15 @@ def test_format_file_list_str_joins_with_newlines(
     assert out.count("\n") == 1
 
 
+@pytest.mark.parametrize("fmt_name", ["str", "xml", "json"])
+def test_format_file_list_accepts_a_one_shot_iterable(
+    fmt_name: str, file_entry: FsEntry, dir_entry: FsEntry
+):
+    fmt = FileFormat(_format=fmt_name, with_types=False)
+    entries = [file_entry, None, dir_entry]
+    assert fmt.format_file_list(iter(entries)) == fmt.format_file_list(entries)
+
+
 # ---------------------------------------------------------------------------
 # format_output (truncation)
 # ---------------------------------------------------------------------------
@@ -174,6 +183,16 @@ def test_format_output_handles_max_smaller_than_footer():
     assert len(out) <= 20
 
 
+def test_format_output_budgets_utf8_bytes_not_characters():
+    # 40 two-byte characters per line: 81 bytes, but only 41 characters.
+    text = "".join("é" * 40 + "\n" for _ in range(10))
+    out = FileFormat.format_output(text, max_output=200, base_offset=0)
+
+    assert out.startswith("é" * 40 + "\n")
+    assert "### truncated at line: 1 ###" in out
+    assert len(out.encode("utf-8")) <= 200
+
+
 def test_format_output_empty_input_returns_empty():
     assert FileFormat.format_output("", max_output=100) == ""
 
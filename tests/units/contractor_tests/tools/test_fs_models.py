@@ -9,6 +9,8 @@ from contractor.tools.fs.models import (
     FsEntry,
     InteractionFilter,
     InteractionKind,
+    _magika,
+    _magika_block_size,
 )
 
 # ---------------------------------------------------------------------------
@@ -80,7 +82,7 @@ def test_matches_filter_read_and_match():
 
 
 # ---------------------------------------------------------------------------
-# FsEntry._compute_line_starts / _char_to_line
+# FsEntry._compute_line_starts / _char_to_line / _line_resolver
 # ---------------------------------------------------------------------------
 
 
@@ -108,6 +110,15 @@ def test_char_to_line_maps_positions():
     assert FsEntry._char_to_line(starts, 7) == 2   # 'f' on line 2
 
 
+def test_line_resolver_agrees_with_char_to_line_in_any_order():
+    starts = FsEntry._compute_line_starts("abc\nde\n\nfgh\n")
+    to_line = FsEntry._line_resolver(starts)
+
+    # Ascending run, then a backwards jump, then ascending again.
+    for pos in (0, 3, 4, 7, 8, 12, 1, 5, 11, 13):
+        assert to_line(pos) == FsEntry._char_to_line(starts, pos), pos
+
+
 # ---------------------------------------------------------------------------
 # FsEntry.from_path
 # ---------------------------------------------------------------------------
@@ -140,6 +151,25 @@ def test_from_path_returns_file_entry_with_size(local_fs, tmp_path: Path):
     assert entry.name == "f.txt"
 
 
+def test_from_info_builds_entries_from_listing_details(local_fs, tmp_path: Path):
+    (tmp_path / "d").mkdir()
+    (tmp_path / "f.txt").write_text("hello", encoding="utf-8")
+
+    by_name = {
+        entry.name: entry
+        for entry in (
+            FsEntry.from_info(info, local_fs, with_types=False)
+            for info in local_fs.ls(str(tmp_path), detail=True)
+        )
+        if entry is not None
+    }
+
+    assert by_name["d"].is_dir
+    assert by_name["f.txt"] == FsEntry.from_path(
+        str(tmp_path / "f.txt"), local_fs, with_types=False
+    )
+
+
 def test_from_path_skips_filetype_when_disabled(local_fs, tmp_path: Path):
     (tmp_path / "f.py").write_text("def f(): return 1\n", encoding="utf-8")
     entry = FsEntry.from_path(str(tmp_path / "f.py"), local_fs, with_types=False)
@@ -147,6 +177,41 @@ def test_from_path_skips_filetype_when_disabled(local_fs, tmp_path: Path):
     assert entry.filetype is None
 
 
+def test_magika_model_is_loaded_once():
+    assert _magika() is _magika()
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        b"",
+        b"def f():\n    return 1\n",
+        b"x = 1\n" * 2000,
+        b"<html><body>\n" * 400 + b"\x00\xff" * 20_000 + b"</body></html>\n" * 400,
+    ],
+    ids=["empty", "small", "larger-than-head", "head-mid-tail-differ"],
+)
+def test_identify_type_matches_full_stream(local_fs, tmp_path: Path, payload: bytes):
+    target = tmp_path / "f.py"
+    target.write_bytes(payload)
+    FsEntry.invalidate_filetype_cache(local_fs)
+
+    with open(target, "rb") as fh:
+        expected = _magika().identify_stream(fh).output
+
+    assert FsEntry.identify_type(str(target), local_fs) == expected
+
+
+def test_magika_sample_follows_model_block_size(local_fs, tmp_path: Path):
+    block_size = _magika()._model_config.block_size
+    assert _magika_block_size() == block_size
+
+    target = tmp_path / "big.bin"
+    target.write_bytes(b"h" * block_size + b"m" * block_size + b"t" * block_size)
+    sample = FsEntry._read_magika_sample(local_fs, str(target))
+    assert sample == b"h" * block_size + b"t" * block_size
+
+
 # ---------------------------------------------------------------------------
 # FsEntry.from_matches
 # ---------------------------------------------------------------------------
@@ -192,6 +257,26 @@ def test_from_matches_records_line_indexes(local_fs, tmp_path: Path):
     assert loc.content == "ERROR: boom"
 
 
+def test_from_matches_byte_offsets_follow_utf8_encoding(local_fs, tmp_path: Path):
+    content = "héllo\nwörld ERROR\n😀 ERROR\n"
+    (tmp_path / "u.txt").write_text(content, encoding="utf-8")
+
+    matches = list(re.compile(r"ERROR").finditer(content))
+    entries = FsEntry.from_matches(
+        matches=matches,
+        file_path=str(tmp_path / "u.txt"),
+        fs=local_fs,
+        content=content,
+        with_types=False,
+    )
+
+    assert entries is not None
+    for entry, match in zip(entries, matches, strict=True):
+        begin, end = match.span()
+        assert entry.loc.byte_start == len(content[:begin].encode("utf-8"))
+        assert entry.loc.byte_end == len(content[:end].encode("utf-8"))
+
+
 def test_from_matches_includes_context_lines(local_fs, tmp_path: Path):
     content = "a\nb\nMATCH\nd\ne\n"
     (tmp_path / "f.txt").write_text(content, encoding="utf-8")
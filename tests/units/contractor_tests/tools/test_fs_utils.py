@@ -1,7 +1,13 @@
+import fnmatch
+
+from contractor.tools.fs.const import _IGNORE_DEFAULTS
 from contractor.tools.fs.utils import (
+    _compile_glob,
+    _compile_ignore_patterns,
     _ensure_int_or_none,
     _format_comment_line,
     _is_ignored,
+    _is_ignored_re,
     _leading_ws,
     _line_ending_for_text,
     _parse_bool,
@@ -34,6 +40,40 @@ def test_is_ignored_empty_patterns():
     assert _is_ignored("/a/b/c.py", []) is False
 
 
+def test_compiled_ignore_union_matches_per_pattern_fnmatch():
+    ignore_re = _compile_ignore_patterns(tuple(_IGNORE_DEFAULTS))
+    assert _compile_ignore_patterns(tuple(_IGNORE_DEFAULTS)) is ignore_re
+
+    for path in (
+        "/repo/.git",
+        "/repo/.git/HEAD",
+        "/repo/src/__pycache__/a.cpython-312.pyc",
+        "/repo/node_modules/x/index.js",
+        "/repo/pkg.egg-info",
+        "/repo/src/main.py",
+        "/repo/README.md",
+    ):
+        basename = path.rsplit("/", 1)[-1]
+        expected = any(
+            fnmatch.fnmatch(path, p) or fnmatch.fnmatch(basename, p)
+            for p in _IGNORE_DEFAULTS
+        )
+        assert _is_ignored_re(path, ignore_re) is expected
+
+    assert _is_ignored_re("/repo/src/main.py", ignore_re) is False
+    assert _is_ignored_re("/anything", None) is False
+
+
+def test_compiled_glob_matches_like_fnmatch():
+    assert _compile_glob("src/*.py") is _compile_glob("src/*.py")
+
+    for pattern in ("*.py", "src/*.py", "**/test_*.py", "[!.]*", "a?c"):
+        compiled = _compile_glob(pattern)
+        for path in ("main.py", "src/main.py", "src/tests/test_x.py", ".env", "abc"):
+            expected = fnmatch.fnmatch(path, pattern)
+            assert (compiled.match(path) is not None) is expected, (pattern, path)
+
+
 # ---------------------------------------------------------------------------
 # _ensure_int_or_none
 # ---------------------------------------------------------------------------
@@ -425,6 +425,29 @@ async def test_persistence_across_instances():
     assert note.tags == ["t"]
 
 
+@pytest.mark.asyncio
+async def test_search_memory_tracks_retags_and_writes_from_other_instances():
+    ctx = FakeArtifactCtx()
+    tools = MemoryTools(name="agent")
+    await tools.write_memory(
+        name="a", memory="m", description="d", tags=["x", "y"], ctx=ctx
+    )
+    assert [m.name for m in await tools.search_memory(["x"], ctx)] == ["a"]
+
+    # Retag through the same instance: the built tag index is patched in place.
+    await tools.write_memory(name="a", memory="m", description="d", tags=["y"], ctx=ctx)
+    assert await tools.search_memory(["x"], ctx) == []
+    assert await tools.list_tags(ctx) == ["y"]
+
+    # A write landing through another instance changes the stored artifact,
+    # so the next call reparses it instead of serving the cached index.
+    other = MemoryTools(name="agent")
+    await other.write_memory(
+        name="b", memory="m", description="d", tags=["x"], ctx=ctx
+    )
+    assert [m.name for m in await tools.search_memory(["x", "y"], ctx)] == ["a", "b"]
+
+
 @pytest.mark.asyncio
 async def test_memory_key_is_namespaced_by_name():
     ctx = FakeArtifactCtx()
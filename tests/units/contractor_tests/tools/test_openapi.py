@@ -1,16 +1,26 @@
+import copy
+import datetime
 import json
 
 import fsspec
 import pytest
+import yaml
 from google.genai import types
 
 from contractor.tools.openapi import (
+    OpenApiArtifact,
     PathItem,
     SecurityScheme,
     openapi_tools,
+    parse_openapi_text,
     validate_files,
     validate_model,
 )
+from contractor.tools.openapi.openapi import (
+    _dump_artifact_text,
+    _parse_artifact_text,
+    openapi_base_schema,
+)
 
 
 class MockToolContext:
@@ -58,6 +68,11 @@ def test_validate_files_ok(fs):
     assert err is None
 
 
+def test_validate_files_custom_extensions(fs):
+    assert validate_files(["main.py"], fs, [".py"]) is not None
+    assert validate_files(["README.md"], fs, [".py"]) is None
+
+
 def test_validate_model_valid_security_scheme():
     ok, err = validate_model(
         SecurityScheme,
@@ -77,6 +92,146 @@ def test_validate_model_invalid_security_scheme():
     assert any(e["field"] == "type" for e in payload["errors"])
 
 
+@pytest.mark.asyncio
+async def test_artifact_round_trips_schema(tool_context):
+    writer = OpenApiArtifact(name="openapi")
+    writer.schema = {
+        "openapi": "3.0.3",
+        "info": {"title": "Пример — API", "description": "line one\nline two"},
+        "paths": {"/on": {"get": {"x-flags": ["yes", "no", "1.0", "~", ""]}}},
+        "components": {"schemas": {"Id": {"type": "integer", "maximum": 10**12}}},
+    }
+    await writer.save_schema(tool_context)
+
+    reader = OpenApiArtifact(name="openapi")
+    assert await reader.load_schema(tool_context) == writer.schema
+
+
+@pytest.mark.asyncio
+async def test_missing_artifact_loads_a_fresh_base_schema(tool_context):
+    snapshot = copy.deepcopy(openapi_base_schema)
+    first = await OpenApiArtifact(name="openapi").load_schema(tool_context)
+    second = await OpenApiArtifact(name="openapi").load_schema(tool_context)
+
+    assert first == second == openapi_base_schema
+    first["info"]["title"] = "t"
+    first["components"]["schemas"]["A"] = {}
+    assert second == openapi_base_schema == snapshot
+
+
+@pytest.mark.asyncio
+async def test_artifact_reparses_only_when_stored_text_changes(tool_context):
+    writer = OpenApiArtifact(name="openapi")
+    await writer.load_schema(tool_context)
+    await writer.update_schema({"info": {"title": "v1"}}, tool_context)
+
+    reader = OpenApiArtifact(name="openapi")
+    first = await reader.load_schema(tool_context)
+    assert await reader.load_schema(tool_context) is first
+
+    await writer.update_schema({"info": {"title": "v2"}}, tool_context)
+    second = await reader.load_schema(tool_context)
+    assert second is not first
+    assert second["info"]["title"] == "v2"
+
+
+@pytest.mark.asyncio
+async def test_artifact_schema_text_matches_dump(tool_context):
+    oas = OpenApiArtifact(name="openapi")
+
+    # Written elsewhere in flow style: rendered through dump(), not echoed.
+    tool_context.artifacts[oas.openapi_key()] = "{openapi: 3.0.3, paths: {}}"
+    assert await oas.load_schema_text(tool_context) == oas.dump()
+    assert oas.dump() == "openapi: 3.0.3\npaths: {}\n"
+
+    await oas.update_schema({"info": {"title": "t"}}, tool_context)
+    text = await oas.load_schema_text(tool_context)
+    assert text == oas.dump()
+    assert await oas.load_schema_text(tool_context) is text
+
+
+@pytest.mark.asyncio
+async def test_artifact_is_stored_as_json_readable_as_yaml(tool_context):
+    oas = OpenApiArtifact(name="openapi")
+    await oas.update_schema({"info": {"title": "Пример"}}, tool_context)
+
+    stored = tool_context.artifacts[oas.openapi_key()]
+    expected = {**openapi_base_schema, "info": {**openapi_base_schema["info"]}}
+    expected["info"]["title"] = "Пример"
+    assert json.loads(stored) == expected
+    assert yaml.safe_load(stored) == expected
+
+
+@pytest.mark.parametrize(
+    "schema",
+    [
+        *(
+            {"info": {"description": text}}
+            for text in ("a\x80b", "nel\x85", "ls\u2028ps\u2029", "\x7f\x9f")
+        ),
+        {"info": {"description": "emoji 😀", "title": "Пример"}},
+        {"maximum": 1e20, "multipleOf": 1e-07, "enum": [-5e-324, 1.5e-07, 3]},
+        {"description": "1e+20", "1e+20": "k"},
+        {"paths": {"/" + "a" * 1100: {"get": {}}}},
+    ],
+)
+def test_dump_artifact_text_round_trips_through_yaml(schema: dict):
+    dumped = _dump_artifact_text(schema)
+    assert yaml.safe_load(dumped) == schema
+    assert parse_openapi_text(dumped) == schema
+
+
+def test_dump_artifact_text_keeps_yaml_only_scalars_typed():
+    schema = {"info": {"version": datetime.date(2024, 1, 1)}}
+    dumped = _dump_artifact_text(schema)
+    assert yaml.safe_load(dumped) == schema
+    assert _parse_artifact_text(dumped) == schema
+
+
+@pytest.mark.asyncio
+async def test_artifact_edits_leave_the_loaded_schema_untouched(tool_context):
+    oas = OpenApiArtifact(name="openapi")
+    await oas.load_schema(tool_context)
+    await oas.update_schema(
+        {"paths": {"/a": {"get": {"summary": "a"}}, "/b": {"get": {}}}}, tool_context
+    )
+    before = oas.schema
+    snapshot = copy.deepcopy(before)
+
+    diff = await oas.update_schema(
+        {"paths": {"/a": {"get": {"summary": "A"}}}}, tool_context
+    )
+    assert diff.changed == {
+        "paths": {
+            "added": {},
+            "removed": {},
+            "changed": {
+                "/a": {
+                    "added": {},
+                    "removed": {},
+                    "changed": {
+                        "get": {
+                            "added": {},
+                            "removed": {},
+                            "changed": {"summary": {"from": "a", "to": "A"}},
+                        }
+                    },
+                }
+            },
+        }
+    }
+
+    def _drop_b(schema):
+        paths = dict(schema["paths"])
+        del paths["/b"]
+        schema["paths"] = paths
+
+    diff = await oas.modify_schema_locked(tool_context, _drop_b)
+    assert diff.changed["paths"]["removed"] == {"/b": {"get": {}}}
+    assert before == snapshot
+    assert "/b" not in oas.schema["paths"]
+
+
 @pytest.mark.asyncio
 async def test_upsert_and_get_path(tool_context, fs):
     tools = openapi_tools("openapi", fs)
@@ -102,6 +257,25 @@ async def test_upsert_and_get_path(tool_context, fs):
     assert res["result"]["get"]["operationId"] == "listPets"
 
 
+@pytest.mark.asyncio
+async def test_upsert_path_accepts_a_path_item_model(tool_context, fs):
+    tools = openapi_tools("openapi", fs)
+    upsert_path = next(t for t in tools if t.__name__ == "upsert_path")
+    path_def = PathItem(
+        get={"operationId": "listPets", "responses": {"200": {"description": "ok"}}}
+    )
+
+    res = await upsert_path("/pets", path_def, ["pets.py"], tool_context)
+    assert "result" in res
+
+    stored = OpenApiArtifact(name="openapi")
+    pets = (await stored.load_schema(tool_context))["paths"]["/pets"]
+    assert pets == {
+        **path_def.model_dump(by_alias=True, exclude_none=True),
+        "x-path-files": ["pets.py"],
+    }
+
+
 @pytest.mark.asyncio
 async def test_remove_path(tool_context, fs):
     tools = openapi_tools("openapi", fs)
@@ -142,6 +316,22 @@ async def test_upsert_and_list_components(tool_context, fs):
     assert "MyResponse" in res["result"]
 
 
+@pytest.mark.asyncio
+async def test_upsert_component_validates_only_modelled_buckets(tool_context, fs):
+    tools = openapi_tools("openapi", fs)
+    upsert_component = next(t for t in tools if t.__name__ == "upsert_component")
+
+    res = await upsert_component(
+        "securitySchemes", "Broken", {"scheme": "basic"}, ["main.py"], tool_context
+    )
+    assert "SecurityScheme" in res["error"]
+
+    res = await upsert_component(
+        "schemas", "Free", {"anything": "goes"}, ["main.py"], tool_context
+    )
+    assert "result" in res
+
+
 @pytest.mark.asyncio
 async def test_set_and_get_info(tool_context, fs):
     tools = openapi_tools("openapi", fs)
@@ -176,6 +366,66 @@ async def test_add_and_remove_server(tool_context, fs):
     assert "result" in res
 
 
+def test_server_index_is_rebuilt_only_for_a_new_list():
+    oas = OpenApiArtifact(name="openapi")
+    servers = [{"url": "a"}, {"url": "b"}, {"url": "a"}]
+
+    index = oas.server_index(servers)
+    assert index == {"a": 0, "b": 1}
+    assert oas.server_index(servers) is index
+    assert oas.server_index([*servers, {"url": "c"}])["c"] == 3
+    assert oas.server_index([{"description": "no url"}, {"url": "a"}]) == {"a": 1}
+
+
+@pytest.mark.asyncio
+async def test_add_and_remove_servers_in_sequence(tool_context, fs):
+    tools = openapi_tools("openapi", fs)
+    add_server = next(t for t in tools if t.__name__ == "add_server")
+    remove_server = next(t for t in tools if t.__name__ == "remove_server")
+    list_servers = next(t for t in tools if t.__name__ == "list_servers")
+
+    for url in ("https://a", "https://b", "https://c"):
+        assert "result" in await add_server(url, None, tool_context)
+    assert "error" in await add_server("https://b", None, tool_context)
+
+    assert "result" in await remove_server("https://b", tool_context)
+    assert "error" in await remove_server("https://b", tool_context)
+
+    res = await list_servers(tool_context)
+    assert [s["url"] for s in res["result"]] == ["https://a", "https://c"]
+
+
+@pytest.mark.asyncio
+async def test_remove_server_drops_every_entry_with_the_url(tool_context, fs):
+    tools = openapi_tools("openapi", fs)
+    remove_server = next(t for t in tools if t.__name__ == "remove_server")
+    list_servers = next(t for t in tools if t.__name__ == "list_servers")
+
+    # Duplicates can only come from an artifact written outside add_server.
+    tool_context.artifacts["user:oas-openapi"] = (
+        "servers:\n- url: https://a\n- url: https://b\n- url: https://a\n"
+    )
+    assert "result" in await remove_server("https://a", tool_context)
+
+    res = await list_servers(tool_context)
+    assert res["result"] == [{"url": "https://b"}]
+
+
+@pytest.mark.asyncio
+async def test_remove_server_keeps_entries_without_url(tool_context, fs):
+    tools = openapi_tools("openapi", fs)
+    remove_server = next(t for t in tools if t.__name__ == "remove_server")
+    list_servers = next(t for t in tools if t.__name__ == "list_servers")
+
+    tool_context.artifacts["user:oas-openapi"] = (
+        "servers:\n- description: no url\n- url: https://a\n"
+    )
+    assert "result" in await remove_server("https://a", tool_context)
+
+    res = await list_servers(tool_context)
+    assert res["result"] == [{"description": "no url"}]
+
+
 @pytest.mark.asyncio
 async def test_remove_path_not_found_returns_error(tool_context, fs):
     # A rejected modifier raises; aguard must surface it as an {"error": ...}
@@ -287,11 +287,41 @@ def test_type_hint_wraps_only_when_enabled(subtask_result: SubtaskExecutionResul
     assert out_hint.endswith("\n```")
 
 
+def test_format_subtasks_yaml_is_one_mapping(subtask: Subtask):
+    fmt = SubtaskFormatter(_format="yaml")
+    other = subtask.model_copy(update={"task_id": "1.3", "status": "done"})
+    parsed = yaml.safe_load(fmt.format_subtasks([subtask, other]))
+    assert list(parsed) == ["task_1.2", "task_1.3"]
+    assert parsed["task_1.3"]["status"] == "done"
+
+    # duplicate ids would collapse in one mapping: keep one document per entry
+    dup = fmt.format_subtask_results([SubtaskExecutionResult(
+        task_id="3", status="done", output="o", summary="s",
+    )] * 2)
+    assert dup.count("result_3:") == 2
+
+
+@pytest.mark.parametrize("fmt_name", ["markdown", "xml"])
+def test_format_subtasks_matches_per_item_rendering(fmt_name: str, subtask: Subtask):
+    fmt = SubtaskFormatter(_format=fmt_name)
+    other = subtask.model_copy(update={"task_id": "1.3"})
+    out = fmt.format_subtasks([subtask, other])
+    for item in (subtask, other):
+        assert str(fmt.format_subtask(item, indent=1)) in out
+
+
 def test_subtask_format_description_xml():
     fmt = SubtaskFormatter(_format="xml")
     assert type(fmt.format_subtask_result_description()) is str
 
 
+def test_subtask_format_description_xml_escapes_every_field():
+    # The description stub is model_construct-ed, so task_id/status hold free
+    # text (e.g. "new->[done,...]") and must be escaped like title/description.
+    out = SubtaskFormatter(_format="xml").format_subtask_description()
+    assert "-&gt;" in out and "->" not in out
+
+
 def test_parse_subtask_result_uses_fenced_block_and_fallback_task_id():
     fmt = SubtaskFormatter(_format="json")
     raw = """```json
@@ -1313,3 +1343,56 @@ async def test_execute_malformed_raw_output_is_truncated_in_record(monkeypatch):
     assert len(rec["output"]) <= _tools_mod._MAX_RECORD_FIELD_LEN + len(
         _tools_mod._TRUNCATION_MARKER
     )
+
+
+def test_subtask_session_rewrites_only_changed_subtasks():
+    mgr = m.StreamlineManager(
+        name="tm", max_tasks=10, fmt=m.SubtaskFormatter(_format="json")
+    )
+    ctx = mk_tool_context()
+    for i in range(3):
+        spec = m.SubtaskSpec(title=f"t{i}", description=f"d{i}")
+        mgr.add_subtask(spec, ctx)
+    before = list(ctx.state[mgr._subtasks_key(ctx)])
+
+    mgr.skip("not needed", ctx)
+
+    after = ctx.state[mgr._subtasks_key(ctx)]
+    assert after[0] is not before[0] and after[0]["status"] == "skipped"
+    assert after[1] is before[1] and after[2] is before[2]
+    assert after[1] == {"task_id": "1", "title": "t1", "description": "d1"}
+    dumped = [s.model_dump(exclude_defaults=True) for s in mgr.get_subtasks(ctx)]
+    assert dumped == after
+
+
+def test_next_root_id_follows_last_root_after_mid_plan_decompose():
+    mgr = m.StreamlineManager(
+        name="tm", max_tasks=10, fmt=m.SubtaskFormatter(_format="json")
+    )
+    ctx = mk_tool_context()
+    for i in range(3):
+        mgr.add_subtask(m.SubtaskSpec(title=f"t{i}", description=f"d{i}"), ctx)
+    result = SubtaskExecutionResult(
+        task_id="0", status="incomplete", output="o", summary="s"
+    )
+    assert mgr.complete_current_subtask(result, ctx) == (True, None)
+    spec = m.SubtaskSpec(title="c", description="c")
+    assert mgr.decompose_current_subtask([spec, spec], ctx) is not None
+
+    new = mgr.add_subtask(m.SubtaskSpec(title="t3", description="d3"), ctx)
+    assert new is not None and new.task_id == "3"
+    ids = [s.task_id for s in mgr.get_subtasks(ctx)]
+    assert ids == ["0", "0.1", "0.2", "1", "2", "3"]
+
+
+def test_refused_add_leaves_stored_plan_unwritten():
+    mgr = m.StreamlineManager(
+        name="tm", max_tasks=1, fmt=m.SubtaskFormatter(_format="json")
+    )
+    ctx = mk_tool_context()
+    spec = m.SubtaskSpec(title="t", description="d")
+    assert mgr.add_subtask(spec, ctx) is not None
+    stored = ctx.state[mgr._subtasks_key(ctx)]
+
+    assert mgr.add_subtask(spec, ctx) is None  # task limit reached
+    assert ctx.state[mgr._subtasks_key(ctx)] is stored
@@ -1,4 +1,7 @@
-from contractor.utils.dictutils import deep_merge, dict_diff
+import copy
+from dataclasses import asdict
+
+from contractor.utils.dictutils import deep_merge, dict_diff, merge_diff
 
 
 def test_deep_merge_simple():
@@ -31,3 +34,47 @@ def test_dict_diff_added_removed_changed():
     assert diff.added == {"d": 4}
     assert diff.removed == {"a": 1}
     assert "c" in diff.changed
+
+
+def test_deep_merge_into_shallow_copy_leaves_original_untouched():
+    base = {"a": {"x": {"k": 1}}, "b": {"y": 1}}
+    result = deep_merge(dict(base), {"a": {"x": {"k": 2}}})
+
+    assert base == {"a": {"x": {"k": 1}}, "b": {"y": 1}}
+    assert result["a"]["x"] == {"k": 2}
+    assert result["b"] is base["b"]
+    assert dict_diff(base, result).changed.keys() == {"a"}
+
+
+def test_deep_merge_copy_values_false_stores_diff_values_by_reference():
+    leaf = {"summary": "s"}
+    copied = deep_merge({"a": {}}, {"a": {"get": leaf}})
+    owned = deep_merge({"a": {}}, {"a": {"get": leaf}}, copy_values=False)
+
+    assert copied == owned == {"a": {"get": {"summary": "s"}}}
+    assert copied["a"]["get"] is not leaf
+    assert owned["a"]["get"] is leaf
+
+
+def test_merge_diff_matches_deep_merge_then_dict_diff():
+    base = {
+        "info": {"title": "t", "version": "1"},
+        "paths": {"/a": {"get": {"summary": "a"}}, "/b": {"get": {}}},
+        "tags": ["x"],
+        "servers": None,
+    }
+    diff = {
+        "info": {"title": "t", "description": "d"},
+        "paths": {"/a": {"get": {"summary": "b"}, "post": {}}, "/c": {}},
+        "tags": ["x"],
+        "servers": [{"url": "/"}],
+    }
+    snapshot = copy.deepcopy(base)
+
+    merged = dict(base)
+    result = merge_diff(merged, diff)
+
+    assert merged == deep_merge(copy.deepcopy(base), diff)
+    assert asdict(result) == asdict(dict_diff(base, merged))
+    assert base == snapshot
+    assert merged["paths"]["/b"] is base["paths"]["/b"]
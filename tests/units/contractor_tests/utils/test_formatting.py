@@ -27,6 +27,11 @@ def test_norm_unicode_passes_through_ascii():
     assert norm_unicode("hello") == "hello"
 
 
+def test_norm_unicode_returns_already_nfc_input_unchanged():
+    nfc = unicodedata.normalize("NFC", "café/naïve.py")
+    assert norm_unicode(nfc) is nfc
+
+
 def test_norm_unicode_strict_raises_on_none():
     with pytest.raises(ValueError, match="Cannot normalize"):
         norm_unicode_strict(None)  # type: ignore[arg-type]
@@ -65,3 +70,8 @@ def test_xml_escape_handles_all_entities():
 def test_xml_escape_amp_first_then_others():
     # Order matters: '&' must be escaped first so we don't double-escape entities.
     assert xml_escape("&lt;") == "&amp;lt;"
+
+
+def test_xml_escape_returns_plain_text_unchanged():
+    value = "/src/app/main.py"
+    assert xml_escape(value) is value